@@ -1,8 +1,11 @@
+import itertools
 import pygame
-import random
+import numpy as np
 from settings import *
+from herd_store import HerdStore, STATES, MOVEMENT_STATES, NEEDS_FEED
 
 class Animal(pygame.sprite.Sprite):
+    """View of one animal - its movement and product state live in a HerdStore"""
     ANIMAL_TYPES = {
         "chicken": {
             "color": (255, 255, 255),
@@ -36,234 +39,169 @@ class Animal(pygame.sprite.Sprite):
         }
     }
     
-    def __init__(self, pos, animal_type="chicken"):
+    # Sprite images shared by all animals of the same type
+    _images = {}
+    
+    # Ids for animals with a private store, so each still gets its own random stream
+    _standalone_ids = itertools.count()
+    
+    def __init__(self, pos, animal_type="chicken", store=None, entity_id=None):
         super().__init__()
         
         self.animal_type = animal_type
         self.data = self.ANIMAL_TYPES[animal_type]
         
-        # Create animal sprite
-        width, height = self.data["size"]
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.create_sprite()
+        # Animal sprites are shared by all animals of the same type
+        self.image = self.get_image(animal_type)
+        self._rect = self.image.get_rect(center=pos)
         
-        self.rect = self.image.get_rect(center=pos)
+        # Movement and product state live in a shared HerdStore (a private one if none is given)
+        self.own_store = store is None
+        self.store = HerdStore(capacity=1) if store is None else store
+        if store is None and entity_id is None:
+            entity_id = next(Animal._standalone_ids)
+        # The id picks the animal's random stream (the herd numbers animals in order if not given)
+        self.slot = self.store.add(self, pos, self._rect.size, self.data, entity_id)
         
-        # Store home position for wandering
-        self.home_pos = pygame.math.Vector2(pos)
-        self.position = pygame.math.Vector2(pos)
+        # Legacy support
+        self.happiness = 100
         
-        # Movement behavior
-        self.speed = self.data["speed"]
-        self.base_speed = self.speed
-        self.direction = pygame.math.Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
-        if self.direction.length() > 0:
-            self.direction = self.direction.normalize()
+    @classmethod
+    def get_image(cls, animal_type):
+        """Get the shared sprite of an animal type, creating it on first use"""
+        image = cls._images.get(animal_type)
+        if image is None:
+            width, height = cls.ANIMAL_TYPES[animal_type]["size"]
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            cls.create_sprite(image, animal_type)
+            cls._images[animal_type] = image
+        return image
         
-        # Behavior timers
-        self.change_direction_timer = 0
-        self.change_direction_delay = random.randint(60, 180)
-        self.pause_timer = 0
-        self.is_paused = random.choice([True, False])
-        self.pause_duration = random.randint(30, 120) if self.is_paused else 0
+    def draw_rect(self, alpha=1):
+        """Rect to draw at, interpolated between the last two simulation steps"""
+        x, y = self.store.render_position(self.slot, alpha).tolist()
+        rect = self._rect.copy()
+        rect.center = (int(x), int(y))
+        return rect
         
-        # Movement state
-        self.wander_radius = self.data["wander_radius"]
-        self.movement_state = random.choice(["wander", "pause", "roam"])
-        self.state_timer = random.randint(120, 300)
+    @property
+    def position(self):
+        return pygame.math.Vector2(*self.store.position[self.slot])
         
-        # Animal state system - proper cycle
-        # States: "has_product" -> "needs_feed" -> "cooldown" -> "producing" -> "has_product"
-        self.state = "has_product"  # Start with product ready
-        self.product_timer = 0
-        self.feed_cooldown_timer = 0
-        self.feed_cooldown_duration = self.data["feed_cooldown"]
+    @property
+    def home_pos(self):
+        return pygame.math.Vector2(*self.store.home[self.slot])
         
-        # Legacy support
-        self.happiness = 100
+    @property
+    def direction(self):
+        return pygame.math.Vector2(*self.store.direction[self.slot])
+        
+    @property
+    def speed(self):
+        return float(self.store.speed[self.slot])
+        
+    @property
+    def is_paused(self):
+        return bool(self.store.is_paused[self.slot])
+        
+    @property
+    def movement_state(self):
+        return MOVEMENT_STATES[self.store.movement_state[self.slot]]
+        
+    @property
+    def state(self):
+        self.store.observe(self.slot)
+        return STATES[self.store.state[self.slot]]
+        
+    @property
+    def product_timer(self):
+        return self.store.product_timer(self.slot)
+        
+    @property
+    def feed_cooldown_timer(self):
+        return self.store.cooldown_left(self.slot)
+        
+    @property
+    def rect(self):
+        # Synced on access, so only animals that are drawn or looked up pay for it
+        x, y = self.store.position[self.slot].tolist()
+        self._rect.center = (int(x), int(y))
+        return self._rect
         
-    def create_sprite(self):
+    @classmethod
+    def create_sprite(cls, image, animal_type):
         """Create animal visual representation"""
-        color = self.data["color"]
-        width, height = self.data["size"]
+        color = cls.ANIMAL_TYPES[animal_type]["color"]
         
-        if self.animal_type == "chicken":
+        if animal_type == "chicken":
             # Body
-            pygame.draw.ellipse(self.image, color, (2, 6, 16, 12))
+            pygame.draw.ellipse(image, color, (2, 6, 16, 12))
             # Head
-            pygame.draw.circle(self.image, color, (14, 6), 5)
+            pygame.draw.circle(image, color, (14, 6), 5)
             # Beak
-            pygame.draw.polygon(self.image, (255, 165, 0), 
+            pygame.draw.polygon(image, (255, 165, 0), 
                               [(17, 6), (22, 5), (22, 7)])
             # Eye
-            pygame.draw.circle(self.image, BLACK, (15, 5), 1)
+            pygame.draw.circle(image, BLACK, (15, 5), 1)
             # Comb
-            pygame.draw.circle(self.image, RED, (14, 2), 2)
+            pygame.draw.circle(image, RED, (14, 2), 2)
             # Legs
-            pygame.draw.line(self.image, (255, 165, 0), (8, 18), (8, 16), 2)
-            pygame.draw.line(self.image, (255, 165, 0), (12, 18), (12, 16), 2)
+            pygame.draw.line(image, (255, 165, 0), (8, 18), (8, 16), 2)
+            pygame.draw.line(image, (255, 165, 0), (12, 18), (12, 16), 2)
             
-        elif self.animal_type == "cow":
+        elif animal_type == "cow":
             # Body
-            pygame.draw.ellipse(self.image, color, (2, 8, 24, 14))
+            pygame.draw.ellipse(image, color, (2, 8, 24, 14))
             # Head
-            pygame.draw.ellipse(self.image, color, (20, 6, 8, 10))
+            pygame.draw.ellipse(image, color, (20, 6, 8, 10))
             # Spots
-            pygame.draw.circle(self.image, BLACK, (8, 12), 3)
-            pygame.draw.circle(self.image, BLACK, (16, 14), 2)
+            pygame.draw.circle(image, BLACK, (8, 12), 3)
+            pygame.draw.circle(image, BLACK, (16, 14), 2)
             # Eyes
-            pygame.draw.circle(self.image, BLACK, (24, 9), 1)
+            pygame.draw.circle(image, BLACK, (24, 9), 1)
             # Horns
-            pygame.draw.line(self.image, (200, 200, 200), (22, 6), (20, 4), 2)
-            pygame.draw.line(self.image, (200, 200, 200), (26, 6), (28, 4), 2)
+            pygame.draw.line(image, (200, 200, 200), (22, 6), (20, 4), 2)
+            pygame.draw.line(image, (200, 200, 200), (26, 6), (28, 4), 2)
             # Legs
             for x in [6, 10, 16, 20]:
-                pygame.draw.line(self.image, color, (x, 22), (x, 20), 2)
+                pygame.draw.line(image, color, (x, 22), (x, 20), 2)
                 
-        elif self.animal_type == "sheep":
+        elif animal_type == "sheep":
             # Fluffy body
-            pygame.draw.circle(self.image, color, (12, 12), 10)
-            pygame.draw.circle(self.image, color, (8, 10), 6)
-            pygame.draw.circle(self.image, color, (16, 10), 6)
+            pygame.draw.circle(image, color, (12, 12), 10)
+            pygame.draw.circle(image, color, (8, 10), 6)
+            pygame.draw.circle(image, color, (16, 10), 6)
             # Head (darker)
-            pygame.draw.circle(self.image, (50, 50, 50), (18, 8), 4)
+            pygame.draw.circle(image, (50, 50, 50), (18, 8), 4)
             # Eye
-            pygame.draw.circle(self.image, BLACK, (19, 7), 1)
+            pygame.draw.circle(image, BLACK, (19, 7), 1)
             # Legs
             for x in [6, 10, 14, 18]:
-                pygame.draw.line(self.image, (50, 50, 50), (x, 20), (x, 18), 2)
+                pygame.draw.line(image, (50, 50, 50), (x, 20), (x, 18), 2)
     
     def choose_new_direction(self):
         """Choose a new random direction"""
-        distance_from_home = self.position.distance_to(self.home_pos)
-        
-        if distance_from_home > self.wander_radius * 1.5:
-            direction_to_home = self.home_pos - self.position
-            if direction_to_home.length() > 0:
-                self.direction = direction_to_home.normalize()
-                self.direction.x += random.uniform(-0.3, 0.3)
-                self.direction.y += random.uniform(-0.3, 0.3)
-                if self.direction.length() > 0:
-                    self.direction = self.direction.normalize()
-        else:
-            angle = random.uniform(0, 2 * 3.14159)
-            self.direction = pygame.math.Vector2(
-                random.uniform(-1, 1),
-                random.uniform(-1, 1)
-            )
-            if self.direction.length() > 0:
-                self.direction = self.direction.normalize()
+        self.store.choose_new_direction(np.array([self.slot]))
     
     def change_movement_state(self):
         """Change between different movement behaviors"""
-        states = ["wander", "pause", "roam", "wander", "roam"]
-        self.movement_state = random.choice(states)
-        
-        if self.movement_state == "pause":
-            self.is_paused = True
-            self.pause_duration = random.randint(30, 120)
-            self.pause_timer = 0
-            self.speed = 0
-        elif self.movement_state == "wander":
-            self.is_paused = False
-            self.speed = self.base_speed * random.uniform(0.5, 1.0)
-            self.choose_new_direction()
-        else:
-            self.is_paused = False
-            self.speed = self.base_speed * random.uniform(0.7, 1.3)
-            self.choose_new_direction()
-        
-        self.state_timer = random.randint(120, 300)
+        self.store.change_movement_state(np.array([self.slot]))
                 
     def update(self, dt):
-        """Update animal behavior"""
-        # State management
-        self.state_timer -= 1
-        if self.state_timer <= 0:
-            self.change_movement_state()
-        
-        # Animal state machine
-        if self.state == "cooldown":
-            # Waiting for cooldown to finish after feeding
-            self.feed_cooldown_timer -= 1
-            if self.feed_cooldown_timer <= 0:
-                # Cooldown finished, start producing
-                self.state = "producing"
-                self.product_timer = 0
-                
-        elif self.state == "producing":
-            # Producing the product
-            self.product_timer += dt
-            if self.product_timer >= self.data["product_time"]:
-                # Product ready!
-                self.state = "has_product"
-                self.product_timer = 0
-                # Brief pause when product is ready
-                self.is_paused = True
-                self.pause_duration = 30
-                self.pause_timer = 0
-        
-        # Handle pausing
-        if self.is_paused:
-            self.pause_timer += 1
-            if self.pause_timer >= self.pause_duration:
-                self.is_paused = False
-                self.speed = self.base_speed * random.uniform(0.7, 1.2)
-                self.choose_new_direction()
-        else:
-            # Random movement direction changes
-            self.change_direction_timer += 1
-            
-            if self.change_direction_timer >= self.change_direction_delay:
-                self.choose_new_direction()
-                self.change_direction_timer = 0
-                self.change_direction_delay = random.randint(60, 180)
-                
-                if random.random() < 0.2:
-                    self.is_paused = True
-                    self.pause_duration = random.randint(20, 60)
-                    self.pause_timer = 0
-                    self.speed = 0
-            
-            # Move using float position for smooth movement
-            self.position.x += self.direction.x * self.speed
-            self.position.y += self.direction.y * self.speed
-            
-            # Update rect position from float position
-            self.rect.centerx = int(self.position.x)
-            self.rect.centery = int(self.position.y)
-            
-            # Keep on screen with bouncing
-            if self.rect.left < 0:
-                self.position.x = self.rect.width // 2
-                self.direction.x = abs(self.direction.x)
-            elif self.rect.right > SCREEN_WIDTH:
-                self.position.x = SCREEN_WIDTH - self.rect.width // 2
-                self.direction.x = -abs(self.direction.x)
-                
-            if self.rect.top < 0:
-                self.position.y = self.rect.height // 2
-                self.direction.y = abs(self.direction.y)
-            elif self.rect.bottom > SCREEN_HEIGHT:
-                self.position.y = SCREEN_HEIGHT - self.rect.height // 2
-                self.direction.y = -abs(self.direction.y)
+        """Update animal behavior - animals in a shared herd are advanced by HerdStore.update"""
+        if self.own_store:
+            self.store.update(dt)
             
-            if (self.rect.left <= 0 or self.rect.right >= SCREEN_WIDTH or 
-                self.rect.top <= 0 or self.rect.bottom >= SCREEN_HEIGHT):
-                if random.random() < 0.5:
-                    self.choose_new_direction()
+    def kill(self):
+        """Remove the animal from all groups and free its slot"""
+        if self.store.animals[self.slot] is self:
+            self.store.remove(self.slot)
+        super().kill()
             
     def feed(self):
         """Feed the animal - only when in needs_feed state"""
-        if self.state == "needs_feed":
-            # Start cooldown
-            self.state = "cooldown"
-            self.feed_cooldown_timer = self.feed_cooldown_duration
+        if self.store.feed(self.slot):
             self.happiness = min(100, self.happiness + 20)
-            # Brief pause when being fed
-            self.is_paused = True
-            self.pause_duration = 20
-            self.pause_timer = 0
             return True
         return False
         
@@ -271,7 +209,7 @@ class Animal(pygame.sprite.Sprite):
         """Collect animal product - only when in has_product state"""
         if self.state == "has_product":
             # Transition to needs_feed state
-            self.state = "needs_feed"
+            self.store.state[self.slot] = NEEDS_FEED
             return self.data["product"], self.data["product_value"]
         return None, 0
     
@@ -297,19 +235,20 @@ class Animal(pygame.sprite.Sprite):
             return f"Producing... ({progress}%)"
         return ""
         
-    def draw_status(self, surface):
+    def draw_status(self, surface, camera, alpha=1):
         """Draw status indicators above animal"""
+        center_x, top = camera.apply_point(self.draw_rect(alpha).midtop)
         if self.state == "has_product":
             # Draw exclamation mark when product ready
             pygame.draw.circle(surface, YELLOW, 
-                             (self.rect.centerx, self.rect.top - 10), 4)
+                             (center_x, top - 10), 4)
             pygame.draw.circle(surface, YELLOW, 
-                             (self.rect.centerx, self.rect.top - 16), 2)
+                             (center_x, top - 16), 2)
                              
         elif self.state == "needs_feed":
             # Draw heart when hungry and needs feeding
-            heart_x = self.rect.centerx
-            heart_y = self.rect.top - 12
+            heart_x = center_x
+            heart_y = top - 12
             pygame.draw.circle(surface, RED, (heart_x - 3, heart_y), 3)
             pygame.draw.circle(surface, RED, (heart_x + 3, heart_y), 3)
             pygame.draw.polygon(surface, RED, [
@@ -320,8 +259,8 @@ class Animal(pygame.sprite.Sprite):
             
         elif self.state == "cooldown":
             # Draw clock icon when on cooldown (digesting)
-            clock_x = self.rect.centerx
-            clock_y = self.rect.top - 12
+            clock_x = center_x
+            clock_y = top - 12
             pygame.draw.circle(surface, GRAY, (clock_x, clock_y), 4)
             pygame.draw.circle(surface, WHITE, (clock_x, clock_y), 4, 1)
             # Clock hand
@@ -334,4 +273,4 @@ class Animal(pygame.sprite.Sprite):
             dot_str = "." * dots
             # Draw small progress indicator
             pygame.draw.circle(surface, (100, 200, 100), 
-                             (self.rect.centerx, self.rect.top - 10), 3)
\ No newline at end of file
+                             (center_x, top - 10), 3)
\ No newline at end of file
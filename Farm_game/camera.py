@@ -0,0 +1,85 @@
+import pygame
+from settings import *
+from sprite_cache import SpriteCache
+
+class Camera:
+    """Viewport onto the world that follows the player and culls what is off-screen"""
+
+    def __init__(self, world_width, world_height, native=NATIVE_RENDERING):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.rect = pygame.Rect(0, 0, world_width, world_height)  # Visible world area
+
+        # How the view is placed on the screen
+        self.scale = 1.0
+        self.screen_rect = pygame.Rect(0, 0, world_width, world_height)
+
+        # Native mode draws straight to the screen with pre-scaled sprites,
+        # otherwise the view is drawn at 1:1 and the whole frame is scaled
+        self.native = native
+        self.render_scale = 1.0  # World pixels -> view surface pixels
+        self.sprites = SpriteCache(SPRITE_CACHE_SIZE)
+
+    def resize(self, screen_width, screen_height):
+        """Fit the view to a new window size"""
+        # Show at most the default window's worth of world, scaled to fit
+        self.scale = min(screen_width / DEFAULT_SCREEN_WIDTH, screen_height / DEFAULT_SCREEN_HEIGHT)
+        if self.native:
+            # Whole pixels per tile, so tiles line up without gaps
+            self.scale = max(1, round(self.scale * TILE_SIZE)) / TILE_SIZE
+        self.render_scale = self.scale if self.native else 1.0
+        self.sprites.set_scale(self.render_scale)
+
+        # Fill the window, but never show more than the world
+        view_width = min(self.world_width, int(screen_width / self.scale))
+        view_height = min(self.world_height, int(screen_height / self.scale))
+        self.rect.size = (view_width, view_height)
+
+        scaled_width = int(view_width * self.scale)
+        scaled_height = int(view_height * self.scale)
+        self.screen_rect = pygame.Rect((screen_width - scaled_width) // 2,
+                                       (screen_height - scaled_height) // 2,
+                                       scaled_width, scaled_height)
+        self.clamp()
+
+    def follow(self, target_pos):
+        """Center the view on a world position"""
+        self.rect.center = (int(target_pos[0]), int(target_pos[1]))
+        self.clamp()
+
+    def clamp(self):
+        """Keep the view inside the world"""
+        self.rect.clamp_ip(pygame.Rect(0, 0, self.world_width, self.world_height))
+
+    def apply(self, rect):
+        """Move a world rect into view surface coordinates"""
+        if self.render_scale == 1:
+            return rect.move(-self.rect.x, -self.rect.y)
+        scale = self.render_scale
+        return pygame.Rect(round((rect.x - self.rect.x) * scale), round((rect.y - self.rect.y) * scale),
+                           round(rect.width * scale), round(rect.height * scale))
+
+    def apply_point(self, pos):
+        """Move a world position into view surface coordinates"""
+        if self.render_scale == 1:
+            return (pos[0] - self.rect.x, pos[1] - self.rect.y)
+        scale = self.render_scale
+        return (round((pos[0] - self.rect.x) * scale), round((pos[1] - self.rect.y) * scale))
+
+    def image(self, image):
+        """Get a sprite image at the view's scale"""
+        return self.sprites.get(image)
+
+    def is_visible(self, rect, margin=0):
+        """Check if a world rect (grown by margin) intersects the view"""
+        return self.rect.colliderect(rect.inflate(margin * 2, margin * 2))
+
+    def is_on_screen(self, screen_pos):
+        """Check if a screen position is inside the drawn view"""
+        return self.screen_rect.collidepoint(screen_pos)
+
+    def screen_to_world(self, screen_pos):
+        """Convert a screen position to a world position"""
+        world_x = (screen_pos[0] - self.screen_rect.x) / self.scale + self.rect.x
+        world_y = (screen_pos[1] - self.screen_rect.y) / self.scale + self.rect.y
+        return (int(world_x), int(world_y))
@@ -0,0 +1,73 @@
+import pygame
+from tile_graphics import TileGraphics
+from tile_grid import EMPTY, KIND_NAMES, WATERED
+from settings import *
+
+class Chunk:
+    """A CHUNK_SIZE x CHUNK_SIZE block of terrain baked into one surface"""
+
+    def __init__(self, world, chunk_pos):
+        self.world = world
+        self.chunk_pos = chunk_pos
+        self.dirty = set()  # Grid positions that must be redrawn
+
+        # Grid area covered by this chunk (clipped at the map edge)
+        self.start_x = chunk_pos[0] * CHUNK_SIZE
+        self.start_y = chunk_pos[1] * CHUNK_SIZE
+        self.end_x = min(self.start_x + CHUNK_SIZE, world.width)
+        self.end_y = min(self.start_y + CHUNK_SIZE, world.height)
+
+        # Pixel area covered by this chunk
+        self.rect = pygame.Rect(self.start_x * TILE_SIZE, self.start_y * TILE_SIZE,
+                                (self.end_x - self.start_x) * TILE_SIZE,
+                                (self.end_y - self.start_y) * TILE_SIZE)
+        self.surface = None
+
+    def build(self):
+        """Bake every tile of the chunk into the chunk surface"""
+        self.surface = pygame.Surface(self.rect.size)
+        self.surface.fill(BLACK)
+        self.dirty.clear()
+
+        grid = self.world.grid
+        grid.ensure_loaded(self.start_x, self.start_y, self.end_x, self.end_y)
+        kinds = grid.kinds[self.start_y:self.end_y, self.start_x:self.end_x].tolist()
+        flags = grid.flags[self.start_y:self.end_y, self.start_x:self.end_x].tolist()
+
+        blits = []
+        for local_y, (kind_row, flag_row) in enumerate(zip(kinds, flags)):
+            for local_x, (code, flag) in enumerate(zip(kind_row, flag_row)):
+                if code == EMPTY:
+                    continue
+                image = TileGraphics.get(KIND_NAMES[code], bool(flag & WATERED))
+                blits.append((image, (local_x * TILE_SIZE, local_y * TILE_SIZE)))
+        self.surface.blits(blits, doreturn=False)
+
+    def mark_dirty(self, grid_pos):
+        """Schedule a tile of this chunk to be redrawn"""
+        self.dirty.add(grid_pos)
+
+    def refresh(self):
+        """Redraw only the tiles that changed since the last draw"""
+        if not self.dirty:
+            return
+
+        grid = self.world.grid
+        for grid_x, grid_y in self.dirty:
+            pos = ((grid_x - self.start_x) * TILE_SIZE, (grid_y - self.start_y) * TILE_SIZE)
+            kind = grid.get_kind(grid_x, grid_y)
+            if kind is None:
+                self.surface.fill(BLACK, (pos, (TILE_SIZE, TILE_SIZE)))
+            else:
+                self.surface.blit(TileGraphics.get(kind, grid.has_flag(grid_x, grid_y, WATERED)), pos)
+        self.dirty.clear()
+
+    def draw(self, surface, camera):
+        """Blit the baked terrain"""
+        self.refresh()
+        surface.blit(self.surface, camera.apply(self.rect))
+
+    def unload(self):
+        """Release the baked surface"""
+        self.surface = None
+        self.dirty.clear()
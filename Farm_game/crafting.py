@@ -1,5 +1,7 @@
 import pygame
 from settings import *
+from fonts import get_font
+from versioning import CachedPanel
 
 class Crafting:
     def __init__(self):
@@ -20,8 +22,9 @@ class Crafting:
                 "amount": 1
             },
         }
-        self.font = pygame.font.Font(None, 20)
-        self.title_font = pygame.font.Font(None, 24)
+        self.panel = CachedPanel()  # Redrawn only when the inventory changes
+        self.font = get_font(20)
+        self.title_font = get_font(24)
         self.show_menu = False
         
     def can_craft(self, recipe_name, inventory):
@@ -65,11 +68,17 @@ class Crafting:
         menu_x = (screen_width - menu_width) // 2
         menu_y = (screen_height - menu_height) // 2
         
+        self.panel.draw(surface, (menu_x, menu_y), (menu_width, menu_height), inventory.items.version,
+                        lambda panel: self.render_menu(panel, inventory))
+        
+    def render_menu(self, surface, inventory):
+        """Render the crafting menu into its panel"""
+        menu_width, menu_height = surface.get_size()
+        menu_x = 0
+        menu_y = 0
+        
         # Semi-transparent background
-        bg = pygame.Surface((menu_width, menu_height))
-        bg.set_alpha(230)
-        bg.fill((40, 40, 40))
-        surface.blit(bg, (menu_x, menu_y))
+        surface.fill((40, 40, 40, 230))
         
         # Border
         pygame.draw.rect(surface, WHITE, (menu_x, menu_y, menu_width, menu_height), 3)
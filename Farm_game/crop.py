@@ -1,5 +1,7 @@
 import pygame
+from collections import OrderedDict
 from settings import *
+from crop_store import CropStore
 
 class Crop(pygame.sprite.Sprite):
     # Crop data: growth_time (seconds), sell_price, seed_cost
@@ -10,27 +12,73 @@ class Crop(pygame.sprite.Sprite):
         "corn": {"growth_time": 30, "sell_price": 50, "seed_cost": 200, "color": (255, 215, 0)},
     }
     
-    def __init__(self, pos, crop_type="wheat", current_time=0):
+    # Stage images shared by all crops: (crop_type, size) -> [Surface per stage]
+    _image_cache = OrderedDict()
+    IMAGE_CACHE_SIZE = 32
+    
+    def __init__(self, pos, crop_type="wheat", current_time=0, store=None):
         super().__init__()
         
         self.crop_type = crop_type
-        self.stage = 0  # 0-3 growth stages
-        self.max_stage = 3
+        self.max_stage = 3  # 0-3 growth stages
         self.growth_time = self.CROP_DATA[crop_type]["growth_time"]
-        self.time_planted = current_time
-        self.needs_water = False  # Start without needing water for first stage
-        self.watered = True  # Consider newly planted crops as watered for initial growth
-        self.ready_to_harvest = False
         
-        # Create crop images for each stage
-        self.images = self.create_crop_images()
+        # Growth state lives in a shared CropStore (a private one if none is given)
+        self.store = store if store is not None else CropStore(capacity=1)
+        self.slot = self.store.add(self, current_time, self.growth_time, self.max_stage)
+        
+        # Stage images are shared by all crops of the same type
+        self.images = self.get_stage_images(crop_type)
         self.image = self.images[self.stage]
         self.rect = self.image.get_rect(topleft=pos)
         
-    def create_crop_images(self):
+    @property
+    def time_planted(self):
+        return float(self.store.time_planted[self.slot])
+        
+    @time_planted.setter
+    def time_planted(self, value):
+        self.store.time_planted[self.slot] = value
+        self.store.schedule(self.slot)
+        
+    @property
+    def stage(self):
+        return int(self.store.stage[self.slot])
+        
+    @property
+    def watered(self):
+        return bool(self.store.watered[self.slot])
+        
+    @property
+    def needs_water(self):
+        return bool(self.store.needs_water[self.slot])
+        
+    @property
+    def ready_to_harvest(self):
+        return self.stage >= self.max_stage
+        
+    @classmethod
+    def get_stage_images(cls, crop_type, size=TILE_SIZE):
+        """Get the cached stage images of a crop type, creating them on first use"""
+        key = (crop_type, size)
+        images = cls._image_cache.get(key)
+        if images is None:
+            images = cls.create_crop_images(crop_type)
+            if size != TILE_SIZE:
+                images = [pygame.transform.scale(img, (size, size)) for img in images]
+            cls._image_cache[key] = images
+            # Keep the cache bounded when there are many crop types or sizes
+            if len(cls._image_cache) > cls.IMAGE_CACHE_SIZE:
+                cls._image_cache.popitem(last=False)
+        else:
+            cls._image_cache.move_to_end(key)
+        return images
+        
+    @classmethod
+    def create_crop_images(cls, crop_type):
         """Create visual representation of crop at different stages"""
         images = []
-        color = self.CROP_DATA[self.crop_type]["color"]
+        color = cls.CROP_DATA[crop_type]["color"]
         
         for stage in range(4):
             img = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
@@ -90,55 +138,40 @@ class Crop(pygame.sprite.Sprite):
         
     def water(self):
         """Water the crop"""
-        if not self.watered:
-            self.watered = True
-            self.needs_water = False
-            return True
-        return False
+        return self.store.water(self.slot)
         
     def update(self, current_time):
         """Update crop growth"""
-        # Calculate growth progress
-        time_since_planted = current_time - self.time_planted
+        self.store.update(current_time, [self.slot])
         
-        # If not watered, grow at 50% speed after stage 1
-        growth_multiplier = 1.0
-        if not self.watered and self.stage >= 1:
-            growth_multiplier = 0.5
-            
-        adjusted_time = time_since_planted * growth_multiplier
-        growth_per_stage = self.growth_time / self.max_stage
-        new_stage = min(int(adjusted_time / growth_per_stage), self.max_stage)
-        
-        # Update stage
-        if new_stage > self.stage:
-            self.stage = new_stage
-            self.image = self.images[self.stage]
-            # Need water for optimal next stage growth
-            if self.stage < self.max_stage:
-                self.needs_water = True
-                self.watered = False
-                
-        # Check if ready to harvest
-        if self.stage >= self.max_stage:
-            self.ready_to_harvest = True
+    def stage_changed(self):
+        """Show the image of the new growth stage"""
+        self.image = self.images[self.stage]
+        
+    def detach(self):
+        """Move this crop's state out of its shared store and free the slot"""
+        store = CropStore(capacity=1)
+        slot = store.add(self, self.time_planted, self.growth_time, self.max_stage)
+        store.stage[slot] = self.stage
+        store.watered[slot] = self.watered
+        store.needs_water[slot] = self.needs_water
+        store.schedule(slot)
+        self.store.remove(self.slot)
+        self.store, self.slot = store, slot
             
-    def draw_status(self, surface):
+    def draw_status(self, surface, camera):
         """Draw status indicators above crop"""
+        center_x, top = camera.apply_point(self.rect.midtop)
         if self.ready_to_harvest:
             # Draw sparkle when ready to harvest
-            import pygame
-            from settings import YELLOW
             pygame.draw.circle(surface, YELLOW, 
-                             (self.rect.centerx, self.rect.top - 5), 3)
+                             (center_x, top - 5), 3)
         elif self.needs_water and self.stage > 0:
             # Draw water drop when needs water
-            import pygame
-            from settings import BLUE
             pygame.draw.circle(surface, BLUE, 
-                             (self.rect.centerx, self.rect.top - 5), 3)
+                             (center_x, top - 5), 3)
             pygame.draw.circle(surface, (150, 200, 255), 
-                             (self.rect.centerx, self.rect.top - 7), 2)
+                             (center_x, top - 7), 2)
             
     def harvest(self):
         """Harvest the crop and return sell price"""
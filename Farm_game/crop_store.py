@@ -0,0 +1,139 @@
+import heapq
+import numpy as np
+
+class CropStore:
+    """Growth state of many crops kept as parallel NumPy arrays (one slot per crop)"""
+
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.size = 0  # Slots in use are always below this index
+        self.free_slots = []
+        self.crops = []  # Crop sprite owning each slot
+        self.transitions = []  # Heap of (time, slot, generation) of the next stage change
+
+        self.time_planted = np.zeros(0, dtype=np.float64)
+        self.growth_time = np.zeros(0, dtype=np.float64)
+        self.max_stage = np.zeros(0, dtype=np.int16)
+        self.stage = np.zeros(0, dtype=np.int16)
+        self.watered = np.zeros(0, dtype=bool)
+        self.needs_water = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.generation = np.zeros(0, dtype=np.int64)  # Bumped to invalidate queued transitions
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Enlarge all arrays to hold at least capacity slots"""
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        for name in ("time_planted", "growth_time", "max_stage", "stage",
+                     "watered", "needs_water", "active", "generation"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros(extra, dtype=array.dtype)]))
+        self.crops.extend([None] * extra)
+        self.capacity = capacity
+
+    def add(self, crop, time_planted, growth_time, max_stage):
+        """Allocate a slot for a crop and return its index"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size >= self.capacity:
+                self.grow(max(1, self.capacity * 2))
+            slot = self.size
+            self.size += 1
+
+        self.crops[slot] = crop
+        self.time_planted[slot] = time_planted
+        self.growth_time[slot] = growth_time
+        self.max_stage[slot] = max_stage
+        self.stage[slot] = 0
+        self.needs_water[slot] = False  # Start without needing water for first stage
+        self.watered[slot] = True  # Newly planted crops count as watered for initial growth
+        self.active[slot] = True
+        self.schedule(slot)
+        return slot
+
+    def remove(self, slot):
+        """Free a slot so it can be reused"""
+        self.active[slot] = False
+        self.generation[slot] += 1
+        self.crops[slot] = None
+        self.free_slots.append(slot)
+
+    def next_transition(self, slot):
+        """Time at which a crop reaches its next stage, or None when fully grown"""
+        stage = self.stage[slot]
+        if stage >= self.max_stage[slot]:
+            return None
+        # If not watered, grow at 50% speed after stage 1
+        growth_multiplier = 0.5 if not self.watered[slot] and stage >= 1 else 1.0
+        growth_per_stage = self.growth_time[slot] / self.max_stage[slot]
+        return float(self.time_planted[slot] + (stage + 1) * growth_per_stage / growth_multiplier)
+
+    def schedule(self, slot, current_time=None):
+        """Queue the next stage change of a crop, replacing any queued one"""
+        self.generation[slot] += 1
+        due = self.next_transition(slot)
+        if due is None:
+            return
+        if current_time is not None and due <= current_time:
+            # Rounding kept the crop from advancing - check again on the next update
+            due = np.nextafter(current_time, np.inf)
+        heapq.heappush(self.transitions, (due, slot, int(self.generation[slot])))
+
+    def water(self, slot):
+        """Water a crop, which can bring its next stage change forward"""
+        if self.watered[slot]:
+            return False
+        self.watered[slot] = True
+        self.needs_water[slot] = False
+        self.schedule(slot)
+        return True
+
+    def due_slots(self, current_time):
+        """Pop every crop whose queued stage change is due"""
+        due = []
+        transitions = self.transitions
+        while transitions and transitions[0][0] <= current_time:
+            _, slot, generation = heapq.heappop(transitions)
+            if generation == self.generation[slot] and self.active[slot]:
+                due.append(slot)
+        return due
+
+    def update(self, current_time, slots=None):
+        """Advance crops that are due (or the given slots), return slots whose stage changed"""
+        if slots is None:
+            # Idle frames stop here without touching any crop
+            if not self.transitions or self.transitions[0][0] > current_time:
+                return np.zeros(0, dtype=np.intp)
+            slots = self.due_slots(current_time)
+        slots = np.asarray(slots, dtype=np.intp)
+        if slots.size == 0:
+            return slots
+
+        stage = self.stage[slots]
+        max_stage = self.max_stage[slots]
+
+        # If not watered, grow at 50% speed after stage 1
+        growth_multiplier = np.where(~self.watered[slots] & (stage >= 1), 0.5, 1.0)
+        adjusted_time = (current_time - self.time_planted[slots]) * growth_multiplier
+        growth_per_stage = self.growth_time[slots] / max_stage
+        new_stage = np.minimum(adjusted_time / growth_per_stage, max_stage).astype(np.int16)
+
+        advanced = new_stage > stage
+        changed = slots[advanced]
+        if changed.size:
+            self.stage[changed] = new_stage[advanced]
+
+            # Need water for optimal next stage growth
+            growing = changed[self.stage[changed] < self.max_stage[changed]]
+            self.needs_water[growing] = True
+            self.watered[growing] = False
+
+            for slot in changed.tolist():
+                self.crops[slot].stage_changed()
+
+        for slot in slots.tolist():
+            self.schedule(slot, current_time)
+        return changed
@@ -0,0 +1,57 @@
+import pygame
+from settings import *
+
+class DirtyTracker:
+    """Works out which parts of the screen changed since the last frame"""
+
+    def __init__(self, threshold=DIRTY_AREA_THRESHOLD):
+        self.threshold = threshold  # Fraction of the screen above which a full redraw is cheaper
+        self.scene = None  # State that needs a full redraw when it changes
+        self.previous = {}  # key -> (screen rect, state) of last frame's drawables
+        self.current = {}
+        self.rects = []
+        self.full = True
+
+    def begin(self, scene):
+        """Start a frame - any change of scene redraws everything"""
+        self.full = scene != self.scene
+        self.scene = scene
+        self.current = {}
+        self.rects = []
+
+    def track(self, key, rect, state=None):
+        """Register something drawn this frame; it's dirty if it moved or changed"""
+        entry = (rect, state)
+        self.current[key] = entry
+        old = self.previous.get(key)
+        if old != entry:
+            self.rects.append(rect)
+            if old is not None:
+                self.rects.append(old[0])
+
+    def mark(self, rect):
+        """Mark a screen area as changed"""
+        self.rects.append(rect)
+
+    def invalidate(self):
+        """Redraw everything on the next frame"""
+        self.scene = None
+
+    def end(self, screen_rect):
+        """Finish a frame - None means redraw everything, else the changed rects"""
+        # Things drawn last frame but not this one leave a hole to repaint
+        for key, (rect, _) in self.previous.items():
+            if key not in self.current:
+                self.rects.append(rect)
+        self.previous = self.current
+
+        if self.full:
+            return None
+        rects = [rect.clip(screen_rect) for rect in self.rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+        if not rects:
+            return []
+        area = rects[0].unionall(rects[1:])
+        if area.width * area.height > self.threshold * screen_rect.width * screen_rect.height:
+            return None
+        return rects
@@ -0,0 +1,31 @@
+import numpy as np
+
+# SplitMix64 constants
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+SHIFTS = (np.uint64(30), np.uint64(27), np.uint64(31))
+
+def mix64(values):
+    """SplitMix64 finalizer - scrambles uint64 values so nearby inputs give unrelated outputs"""
+    # Arrays wrap on overflow silently (scalars would warn), so scalars are made 1-element arrays
+    z = np.array(values, dtype=np.uint64, ndmin=1) + GOLDEN_GAMMA
+    z = (z ^ (z >> SHIFTS[0])) * MIX_1
+    z = (z ^ (z >> SHIFTS[1])) * MIX_2
+    return z ^ (z >> SHIFTS[2])
+
+def stream_keys(seed, ids):
+    """Keys of the random streams of entity ids under a world seed"""
+    return mix64(mix64(np.uint64(seed)) ^ mix64(ids))
+
+def stream_bits(keys, counters):
+    """Random 64-bit values of streams at the given draw counters
+
+    Counter-based: a value depends only on (seed, id, counter), never on what
+    other entities drew or in which order, so any subset of entities can be
+    simulated separately and still give the same results."""
+    return mix64(keys ^ mix64(counters))
+
+def stream_floats(keys, counters):
+    """Uniform floats in [0, 1) of streams at the given draw counters"""
+    return (stream_bits(keys, counters) >> np.uint64(11)) * (1.0 / (1 << 53))
@@ -0,0 +1,69 @@
+import pygame
+from collections import OrderedDict
+from settings import *
+
+class TextCache:
+    """LRU cache of rendered text surfaces shared by every font"""
+    _surfaces = OrderedDict()  # (font name, size, text, antialias, color, background) -> Surface
+    capacity = TEXT_CACHE_SIZE
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def render(cls, font, text, antialias, color, background=None):
+        """Render text with a font, reusing the surface if it was rendered before"""
+        key = (font.name, font.point_size, text, antialias, tuple(color),
+               tuple(background) if background is not None else None)
+        surface = cls._surfaces.get(key)
+        if surface is not None:
+            cls.hits += 1
+            cls._surfaces.move_to_end(key)
+            return surface
+
+        cls.misses += 1
+        surface = font.font.render(text, antialias, color, background)
+        cls._surfaces[key] = surface
+        if len(cls._surfaces) > cls.capacity:
+            cls._surfaces.popitem(last=False)
+        return surface
+
+    @classmethod
+    def stats(cls):
+        """Hit/miss counters and current size of the cache"""
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls._surfaces)}
+
+    @classmethod
+    def clear(cls):
+        """Forget all rendered text and reset the counters"""
+        cls._surfaces.clear()
+        cls.hits = 0
+        cls.misses = 0
+
+class CachedFont:
+    """A loaded font whose render() goes through the shared text cache"""
+
+    def __init__(self, name, point_size):
+        self.name = name
+        self.point_size = point_size
+        self.font = pygame.font.Font(name, point_size)
+
+    def render(self, text, antialias, color, background=None):
+        """Render text (the surface is shared - don't draw on it)"""
+        return TextCache.render(self, text, antialias, color, background)
+
+    def size(self, text):
+        return self.font.size(text)
+
+    def get_height(self):
+        return self.font.get_height()
+
+_fonts = {}  # (name, size) -> CachedFont
+
+def get_font(point_size, name=None):
+    """Get the shared font for a file name (None for the default font) and size"""
+    key = (name, point_size)
+    font = _fonts.get(key)
+    if font is None:
+        font = CachedFont(name, point_size)
+        _fonts[key] = font
+    return font
@@ -0,0 +1,37 @@
+class GameClock:
+    """Shared game time in ticks (one tick is a 60 FPS frame), advanced by the main loop's dt"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def advance(self, dt):
+        """Move time forward - any step size, timers only compare deadlines"""
+        self.now += dt
+
+    def timer(self, duration=0):
+        """Create a timer on this clock"""
+        return Timer(self, duration)
+
+class Timer:
+    """Deadline on a GameClock, so it runs out correctly however large the time steps are"""
+
+    def __init__(self, clock, duration=0):
+        self.clock = clock
+        self.deadline = clock.now + duration
+
+    def start(self, duration):
+        """Run out after a number of ticks from now"""
+        self.deadline = self.clock.now + duration
+
+    def stop(self):
+        """Run out now"""
+        self.deadline = self.clock.now
+
+    @property
+    def remaining(self):
+        """Ticks left before the timer runs out"""
+        return max(0.0, self.deadline - self.clock.now)
+
+    @property
+    def done(self):
+        return self.clock.now >= self.deadline
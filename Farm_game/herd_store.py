@@ -0,0 +1,430 @@
+import numpy as np
+from settings import *
+from game_clock import GameClock
+from entity_random import stream_keys, stream_floats
+
+# Product cycle: has_product -> needs_feed -> cooldown -> producing -> has_product
+STATES = ("has_product", "needs_feed", "cooldown", "producing")
+HAS_PRODUCT, NEEDS_FEED, COOLDOWN, PRODUCING = range(4)
+
+# Movement behaviours
+MOVEMENT_STATES = ("wander", "pause", "roam")
+WANDER, PAUSE, ROAM = range(3)
+MOVEMENT_CHOICES = np.array([WANDER, PAUSE, ROAM, WANDER, ROAM], dtype=np.int8)  # Weighted pick
+
+# Level of detail: visible animals move every frame, near ones every few frames, far ones not at all
+VISIBLE, NEAR, FAR = range(3)
+
+EDGE_EPSILON = 1e-6  # Pixels from the edge of the area that count as touching it
+
+class HerdStore:
+    """Movement and product state of many animals kept as parallel NumPy arrays (one slot per animal)"""
+
+    def __init__(self, capacity=64, bounds=(SCREEN_WIDTH, SCREEN_HEIGHT), index=None, clock=None,
+                 seed=WORLD_SEED):
+        self.capacity = 0
+        self.size = 0  # Slots in use are always below this index
+        self.free_slots = []
+        self.animals = []  # Animal sprite owning each slot
+        self.bounds = bounds  # Area animals bounce around in (world pixels)
+        self.bounds_array = np.array(bounds, dtype=np.float64)
+        self.seed = seed  # Every animal draws from its own random stream derived from this and its id
+        self.next_id = 0
+        self.index = index  # SpatialHash kept up to date as animals cross its cells
+
+        # Timers are deadlines on the game clock (a private one, advanced by update, if none is given)
+        self.own_clock = clock is None
+        self.clock = GameClock() if clock is None else clock
+
+        self.entity_id = np.zeros(0, dtype=np.uint64)
+        self.stream_key = np.zeros(0, dtype=np.uint64)  # Key of each animal's random stream
+        self.draws = np.zeros(0, dtype=np.uint64)  # Random numbers each animal has drawn so far
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.previous_position = np.zeros((0, 2), dtype=np.float64)  # Position at the previous step
+        self.home = np.zeros((0, 2), dtype=np.float64)
+        self.direction = np.zeros((0, 2), dtype=np.float64)
+        self.half_size = np.zeros((0, 2), dtype=np.float64)  # Half the sprite size, for edge bouncing
+        self.cell = np.zeros((0, 2), dtype=np.int64)  # Spatial hash cell each animal is filed under
+        self.speed = np.zeros(0, dtype=np.float64)
+        self.base_speed = np.zeros(0, dtype=np.float64)
+        self.wander_radius = np.zeros(0, dtype=np.float64)
+
+        # Behaviour deadlines (game clock ticks)
+        self.turn_at = np.zeros(0, dtype=np.float64)  # Next random change of direction
+        self.pause_until = np.zeros(0, dtype=np.float64)
+        self.is_paused = np.zeros(0, dtype=bool)
+        self.movement_state = np.zeros(0, dtype=np.int8)
+        self.state_until = np.zeros(0, dtype=np.float64)  # Next change of movement state
+        self.moved_at = np.zeros(0, dtype=np.float64)  # Time up to which the animal has moved
+
+        # Product cycle
+        self.state = np.zeros(0, dtype=np.int8)
+        self.cooldown_until = np.zeros(0, dtype=np.float64)  # End of digestion
+        self.ready_at = np.zeros(0, dtype=np.float64)  # Time the product being produced is ready
+        self.product_time = np.zeros(0, dtype=np.float64)
+        self.feed_cooldown_duration = np.zeros(0, dtype=np.float64)
+        self.active = np.zeros(0, dtype=bool)
+        self.tier = np.zeros(0, dtype=np.int8)  # Level of detail
+        self.near_turn = 0  # Which near animals move this frame
+        self.grow(capacity)
+
+    ARRAYS = ("entity_id", "stream_key", "draws", "position", "previous_position", "home", "direction", "half_size", "cell", "speed", "base_speed", "wander_radius",
+              "turn_at", "pause_until", "is_paused", "movement_state", "state_until", "moved_at",
+              "state", "cooldown_until", "ready_at", "product_time", "feed_cooldown_duration",
+              "active", "tier")
+
+    def grow(self, capacity):
+        """Enlarge all arrays to hold at least capacity slots"""
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            padding = np.zeros((extra,) + array.shape[1:], dtype=array.dtype)
+            setattr(self, name, np.concatenate([array, padding]))
+        self.animals.extend([None] * extra)
+        self.capacity = capacity
+
+    def add(self, animal, pos, size, data, entity_id=None):
+        """Allocate a slot for an animal and return its index"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size >= self.capacity:
+                self.grow(max(1, self.capacity * 2))
+            slot = self.size
+            self.size += 1
+
+        if entity_id is None:
+            entity_id = self.next_id
+        self.next_id = max(self.next_id, entity_id + 1)
+        self.entity_id[slot] = entity_id
+        self.stream_key[slot] = stream_keys(self.seed, np.array([entity_id], dtype=np.uint64))[0]
+        self.draws[slot] = 0
+
+        self.animals[slot] = animal
+        self.position[slot] = pos
+        self.previous_position[slot] = pos
+        self.home[slot] = pos
+        self.half_size[slot] = (size[0] // 2, size[1] // 2)
+        self.speed[slot] = self.base_speed[slot] = data["speed"]
+        self.wander_radius[slot] = data["wander_radius"]
+        slots = np.array([slot])
+        self.direction[slot] = self.normalized(self.uniform(slots, -1, 1, 2))[0]
+
+        now = self.clock.now
+        self.turn_at[slot] = now + self.integers(slots, 60, 181)[0]
+        self.is_paused[slot] = self.random(slots)[0] < 0.5
+        self.pause_until[slot] = now + (self.integers(slots, 30, 121)[0] if self.is_paused[slot] else 0)
+        self.movement_state[slot] = self.integers(slots, 0, 3)[0]
+        self.state_until[slot] = now + self.integers(slots, 120, 301)[0]
+        self.moved_at[slot] = now
+
+        self.state[slot] = HAS_PRODUCT  # Start with product ready
+        self.cooldown_until[slot] = now
+        self.ready_at[slot] = now
+        self.product_time[slot] = data["product_time"]
+        self.feed_cooldown_duration[slot] = data["feed_cooldown"]
+        self.active[slot] = True
+        self.tier[slot] = VISIBLE  # Sorted into its tier on the next update
+        if self.index is not None:
+            self.index.insert(animal, pos, "animal")
+            self.cell[slot] = self.index.cell_of(pos)
+        return slot
+
+    def remove(self, slot):
+        """Free a slot so it can be reused"""
+        self.active[slot] = False
+        if self.index is not None:
+            self.index.remove(self.animals[slot])
+        self.animals[slot] = None
+        self.free_slots.append(slot)
+
+    def random(self, slots, count=None):
+        """Next uniform floats in [0, 1) from each animal's own stream (count per animal if given)"""
+        if slots.size == 0:
+            return np.zeros(0 if count is None else (0, count))
+        draws = 1 if count is None else count
+        counters = self.draws[slots][:, None] + np.arange(draws, dtype=np.uint64)
+        self.draws[slots] += np.uint64(draws)
+        values = stream_floats(self.stream_key[slots][:, None], counters)
+        return values[:, 0] if count is None else values
+
+    def uniform(self, slots, low, high, count=None):
+        """Next uniform floats in [low, high) for each animal"""
+        return low + (high - low) * self.random(slots, count)
+
+    def integers(self, slots, low, high):
+        """Next integers in [low, high) for each animal"""
+        return low + (self.random(slots) * (high - low)).astype(np.int64)
+
+    def choose_new_direction(self, slots):
+        """Pick new directions - animals far from home head back, the rest pick at random"""
+        if slots.size == 0:
+            return
+        to_home = self.home[slots] - self.position[slots]
+        distance = np.hypot(to_home[:, 0], to_home[:, 1])
+        far = distance > self.wander_radius[slots] * 1.5
+
+        # Far from home: head home with a little jitter
+        homing_mask = far & (distance > 0)
+        homing = slots[homing_mask]
+        if homing.size:
+            direction = to_home[homing_mask] / distance[homing_mask][:, None]
+            direction += self.uniform(homing, -0.3, 0.3, 2)
+            self.direction[homing] = self.normalized(direction)
+
+        # Near home: any direction
+        wandering = slots[~far]
+        if wandering.size:
+            self.direction[wandering] = self.normalized(self.uniform(wandering, -1, 1, 2))
+
+    @staticmethod
+    def normalized(vectors):
+        """Scale vectors to unit length, leaving zero vectors alone"""
+        length = np.hypot(vectors[:, 0], vectors[:, 1])[:, None]
+        return np.divide(vectors, length, out=vectors, where=length > 0)
+
+    def change_movement_state(self, slots, now=None):
+        """Switch animals between wandering, pausing and roaming (at the clock's time or per-animal times)"""
+        if slots.size == 0:
+            return
+        now = np.broadcast_to(self.clock.now if now is None else now, slots.shape)
+        movement = MOVEMENT_CHOICES[self.integers(slots, 0, len(MOVEMENT_CHOICES))]
+        self.movement_state[slots] = movement
+
+        pausing_mask = movement == PAUSE
+        pausing = slots[pausing_mask]
+        self.pause(pausing, self.integers(pausing, 30, 121), now[pausing_mask])
+        self.speed[pausing] = 0
+
+        wandering = slots[movement == WANDER]
+        self.speed[wandering] = self.base_speed[wandering] * self.uniform(wandering, 0.5, 1.0)
+        roaming = slots[movement == ROAM]
+        self.speed[roaming] = self.base_speed[roaming] * self.uniform(roaming, 0.7, 1.3)
+        moving = slots[movement != PAUSE]
+        self.is_paused[moving] = False
+        self.choose_new_direction(moving)
+
+        self.state_until[slots] = now + self.integers(slots, 120, 301)
+
+    def pause(self, slots, duration, start=None):
+        """Stop animals for a number of ticks (from now, or from a given time)"""
+        self.is_paused[slots] = True
+        self.pause_until[slots] = (self.clock.now if start is None else start) + duration
+
+    def update(self, dt, view=None):
+        """Advance the herd to the current game time - with a view rect, off-screen animals are simulated in less detail"""
+        if self.own_clock:
+            self.clock.advance(dt)
+        count = self.size
+        if count == 0:
+            return
+        self.previous_position[:count] = self.position[:count]
+        slots = np.nonzero(self.active[:count])[0]
+        if view is not None:
+            slots = self.update_tiers(slots, view)
+
+        # Near animals move in bigger steps every few frames, staggered by id
+        tier = self.tier[slots]
+        near = slots[tier == NEAR]
+        self.near_turn = (self.near_turn + 1) % LOD_NEAR_INTERVAL
+        turn = self.entity_id[near] % LOD_NEAR_INTERVAL == self.near_turn
+        self.advance(np.concatenate([slots[tier == VISIBLE], near[turn]]))
+        self.produce(near[~turn])  # Near animals that sit this frame out
+
+    def update_tiers(self, slots, view):
+        """Sort animals into detail tiers around the view, return the ones simulated this frame"""
+        visible = np.zeros(self.size, dtype=bool)
+        near = np.zeros(self.size, dtype=bool)
+        visible[self.slots_in(view.inflate(TILE_SIZE * 2, TILE_SIZE * 2))] = True
+        near[self.slots_in(view.inflate(LOD_NEAR_MARGIN * 2, LOD_NEAR_MARGIN * 2))] = True
+        tier = np.where(visible, VISIBLE, np.where(near, NEAR, FAR)).astype(np.int8)[slots]
+
+        # Far animals stand still - they pick up from now once they come closer again
+        waking = slots[(self.tier[slots] == FAR) & (tier != FAR)]
+        self.moved_at[waking] = self.clock.now
+        self.tier[slots] = tier
+        return slots[tier != FAR]
+
+    def render_position(self, slot, alpha=1):
+        """Position to draw an animal at, a fraction alpha of the way from the previous step to the current one"""
+        previous = self.previous_position[slot]
+        return previous + (self.position[slot] - previous) * alpha
+
+    def observe(self, slot):
+        """Make the product state of one animal exact before it is read or changed"""
+        if self.tier[slot] == FAR:
+            self.produce(np.array([slot]))
+
+    def advance(self, slots):
+        """Move animals up to the current time, segment by segment between their deadlines"""
+        now = self.clock.now
+        slots = self.glide(slots, now)
+        while slots.size:
+            # End the segment at each animal's next deadline or edge, so a large time step
+            # follows the same path as many small ones
+            deadline = self.next_deadline(slots)
+            until = np.minimum(deadline, self.moved_at[slots] + self.time_to_edge(slots))
+            until = np.clip(until, self.moved_at[slots], now)
+            self.move(slots, until)
+
+            # Only segments that ended at a deadline have events to handle
+            due = deadline <= until
+            if due.any():
+                events, at = slots[due], until[due]
+                self.produce(events, at)
+                self.behave(events, at)
+                self.steer(events, at)
+            slots = slots[until < now]
+
+    def glide(self, slots, now):
+        """Move animals with nothing due and no edge in reach before now in one pass, return the others"""
+        reach = np.where(self.is_paused[slots], 0, self.speed[slots]) * (now - self.moved_at[slots])
+        position = self.position[slots]
+        half = self.half_size[slots]
+        room = np.minimum(position - half, self.bounds_array - half - position)
+        quiet = (reach == 0) | (np.minimum(room[:, 0], room[:, 1]) > reach + EDGE_EPSILON)
+        quiet &= self.next_deadline(slots) > now
+
+        gliding = slots[quiet]
+        self.position[gliding] = position[quiet] + self.direction[gliding] * reach[quiet][:, None]
+        self.moved_at[gliding] = now
+        self.update_index(gliding)
+        return slots[~quiet]
+
+    def next_deadline(self, slots):
+        """Time of the next event of each animal: a product step, a change of state, and a turn or the end of a pause"""
+        state = self.state[slots]
+        deadline = np.where(self.is_paused[slots], self.pause_until[slots], self.turn_at[slots])
+        deadline = np.minimum(deadline, self.state_until[slots])
+        deadline = np.where(state == COOLDOWN, np.minimum(deadline, self.cooldown_until[slots]), deadline)
+        return np.where(state == PRODUCING, np.minimum(deadline, self.ready_at[slots]), deadline)
+
+    def time_to_edge(self, slots):
+        """Ticks until moving animals reach the edge of the area they are heading for (inf if never)"""
+        velocity = self.direction[slots] * self.speed[slots][:, None]
+        velocity[self.is_paused[slots]] = 0
+        half = self.half_size[slots]
+        target = np.where(velocity > 0, self.bounds_array - half, half)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time = np.where(velocity != 0, (target - self.position[slots]) / velocity, np.inf)
+        return np.maximum(time, 0).min(axis=1)
+
+    def behave(self, slots, now=None):
+        """Change the movement behaviour of animals whose current one is over"""
+        now = np.broadcast_to(self.clock.now if now is None else now, slots.shape)
+        due = self.state_until[slots] <= now
+        self.change_movement_state(slots[due], now[due])
+
+    def produce(self, slots, now=None):
+        """Advance the product cycle to the current time (or per-animal times) - deadlines make any time step exact"""
+        now = np.broadcast_to(self.clock.now if now is None else now, slots.shape)
+        digest = (self.state[slots] == COOLDOWN) & (self.cooldown_until[slots] <= now)
+        digested = slots[digest]
+        self.state[digested] = PRODUCING  # Cooldown finished, start producing
+        self.ready_at[digested] = self.cooldown_until[digested] + self.product_time[digested]
+
+        produced = slots[(self.state[slots] == PRODUCING) & (self.ready_at[slots] <= now)]
+        self.state[produced] = HAS_PRODUCT
+        self.pause(produced, 30, self.ready_at[produced])  # Brief pause when product is ready
+
+    def move(self, slots, now):
+        """Move animals in a straight line up to per-animal times, bouncing off the edges of the area"""
+        elapsed = now - self.moved_at[slots]
+        self.moved_at[slots] = now
+        moving = slots[~self.is_paused[slots]]
+        elapsed = elapsed[~self.is_paused[slots]]
+
+        position = self.position[moving]
+        half = self.half_size[moving]
+        low_edge = half + EDGE_EPSILON
+        high_edge = self.bounds_array - half - EDGE_EPSILON
+        was_touching = (position <= low_edge) | (position >= high_edge)
+        position = position + self.direction[moving] * (self.speed[moving] * elapsed)[:, None]
+
+        # Turn back from the edges, and sometimes head somewhere else on reaching one
+        low = position <= low_edge
+        high = ~low & (position >= high_edge)
+        direction = self.direction[moving]
+        direction = np.where(low, np.abs(direction), direction)
+        direction = np.where(high, -np.abs(direction), direction)
+        self.position[moving] = np.clip(position, half, self.bounds_array - half)
+        self.direction[moving] = direction
+
+        arrived = moving[((low | high) & ~was_touching).any(axis=1)]
+        self.choose_new_direction(arrived[self.random(arrived) < 0.5])
+        self.update_index(moving)
+
+    def steer(self, slots, now):
+        """Set off animals whose pause is over, turn (and sometimes stop) moving ones whose turn is due"""
+        paused = self.is_paused[slots]
+        waiting = slots[paused]
+        rested = waiting[self.pause_until[waiting] <= now[paused]]
+        self.is_paused[rested] = False
+        self.speed[rested] = self.base_speed[rested] * self.uniform(rested, 0.7, 1.2)
+        self.choose_new_direction(rested)
+
+        moving = slots[~paused]
+        now = now[~paused]
+        turn = self.turn_at[moving] <= now
+        turning = moving[turn]
+        turned_at = now[turn]
+        self.choose_new_direction(turning)
+        self.turn_at[turning] = turned_at + self.integers(turning, 60, 181)
+        stop = self.random(turning) < 0.2
+        stopping = turning[stop]
+        self.pause(stopping, self.integers(stopping, 20, 61), turned_at[stop])
+        self.speed[stopping] = 0
+
+    def update_index(self, slots):
+        """Refile the animals that crossed into another spatial hash cell"""
+        if self.index is None or slots.size == 0:
+            return
+        cell = (self.position[slots] // self.index.cell_size).astype(np.int64)
+        changed = cell != self.cell[slots]
+        crossed = changed[:, 0] | changed[:, 1]
+        for slot, pos in zip(slots[crossed].tolist(), self.position[slots[crossed]].tolist()):
+            self.index.move(self.animals[slot], pos)
+        self.cell[slots[crossed]] = cell[crossed]
+
+    def feed(self, slot):
+        """Feed an animal - only when it needs feeding"""
+        self.observe(slot)
+        if self.state[slot] != NEEDS_FEED:
+            return False
+        self.state[slot] = COOLDOWN
+        self.cooldown_until[slot] = self.clock.now + self.feed_cooldown_duration[slot]
+        self.pause(slot, 20)  # Brief pause when being fed
+        return True
+
+    def product_timer(self, slot):
+        """Ticks an animal has been producing for"""
+        self.observe(slot)
+        if self.state[slot] != PRODUCING:
+            return 0.0
+        return float(self.clock.now - (self.ready_at[slot] - self.product_time[slot]))
+
+    def cooldown_left(self, slot):
+        """Ticks of digestion an animal has left"""
+        self.observe(slot)
+        if self.state[slot] != COOLDOWN:
+            return 0.0
+        return float(self.cooldown_until[slot] - self.clock.now)
+
+    def slots_in(self, rect):
+        """Slots of the animals whose sprite overlaps a world rect"""
+        count = self.size
+        position = self.position[:count]
+        half = self.half_size[:count]
+        inside = self.active[:count].copy()
+        inside &= position[:, 0] + half[:, 0] > rect.left
+        inside &= position[:, 0] - half[:, 0] < rect.right
+        inside &= position[:, 1] + half[:, 1] > rect.top
+        inside &= position[:, 1] - half[:, 1] < rect.bottom
+        return np.nonzero(inside)[0]
+
+    def visible(self, rect):
+        """Animals overlapping a world rect"""
+        animals = self.animals
+        return [animals[slot] for slot in self.slots_in(rect).tolist()]
@@ -1,10 +1,13 @@
 import pygame
 from settings import *
+from fonts import get_font
 from crop import Crop
+from versioning import VersionedDict, CachedPanel
 
 class Inventory:
     def __init__(self):
-        # Main inventory storage (36 slots)
+        # Main inventory storage (36 slots) - a VersionedDict so panels know when to redraw
+        self._items = VersionedDict()
         self.items = {
             "wheat_seed": INITIAL_SEEDS,
             "carrot_seed": 5,
@@ -26,10 +29,15 @@ class Inventory:
         self.show_full_inventory = False
         self.selected_inventory_item = None
         
+        # Panels redrawn only when what they show changes
+        self.hotbar_panel = CachedPanel()
+        self.inventory_panel = CachedPanel()
+        self.overlay = None
+        
         # Fonts
-        self.font = pygame.font.Font(None, 20)
-        self.title_font = pygame.font.Font(None, 28)
-        self.small_font = pygame.font.Font(None, 16)
+        self.font = get_font(20)
+        self.title_font = get_font(28)
+        self.small_font = get_font(16)
         
         # Item categories for display
         self.item_categories = {
@@ -40,6 +48,17 @@ class Inventory:
             "Crafted": ["fence", "scarecrow", "chest"]
         }
         
+    @property
+    def items(self):
+        return self._items
+        
+    @items.setter
+    def items(self, items):
+        # Keep counting up so a replaced dict never looks unchanged
+        version = self._items.version + 1
+        self._items = VersionedDict(items)
+        self._items.version = version
+        
     def add_item(self, item, amount=1):
         """Add item to inventory"""
         if item in self.items:
@@ -186,6 +205,17 @@ class Inventory:
         start_x = (screen_width - total_width) // 2
         start_y = screen_height - slot_size - 20
         
+        key = (self.items.version, tuple(self.hotbar), self.selected_hotbar_slot)
+        self.hotbar_panel.draw(surface, (start_x, start_y), (total_width, slot_size), key,
+                               self.render_hotbar)
+    
+    def render_hotbar(self, surface):
+        """Render the hotbar slots into its panel"""
+        slot_size = 64
+        spacing = 8
+        start_x = 0
+        start_y = 0
+        
         for i in range(5):
             x = start_x + i * (slot_size + spacing)
             y = start_y
@@ -270,10 +300,11 @@ class Inventory:
             return
         
         # Draw semi-transparent background overlay
-        overlay = pygame.Surface((screen_width, screen_height))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        if self.overlay is None or self.overlay.get_size() != (screen_width, screen_height):
+            self.overlay = pygame.Surface((screen_width, screen_height))
+            self.overlay.set_alpha(180)
+            self.overlay.fill((0, 0, 0))
+        surface.blit(self.overlay, (0, 0))
         
         # Responsive panel dimensions
         panel_width = min(600, screen_width - 40)
@@ -281,6 +312,16 @@ class Inventory:
         panel_x = (screen_width - panel_width) // 2
         panel_y = (screen_height - panel_height) // 2
         
+        key = (self.items.version, tuple(self.hotbar), self.selected_hotbar_slot, self.selected_inventory_item)
+        self.inventory_panel.draw(surface, (panel_x, panel_y), (panel_width, panel_height), key,
+                                  self.render_full_inventory)
+    
+    def render_full_inventory(self, surface):
+        """Render the inventory panel (grid and integrated hotbar) into its panel"""
+        panel_width, panel_height = surface.get_size()
+        panel_x = 0
+        panel_y = 0
+        
         # Draw panel background
         bg = pygame.Surface((panel_width, panel_height))
         bg.fill((40, 40, 40))
@@ -0,0 +1,144 @@
+import pygame
+import numpy as np
+from collections import OrderedDict
+from settings import *
+from tile_grid import KIND_CODES
+
+class Light:
+    """A point light - attached to an entity or placed in the world"""
+
+    def __init__(self, radius, color=(255, 220, 170)):
+        self.radius = radius  # World pixels
+        self.color = color
+
+# Lights given off by tile kinds
+TILE_LIGHTS = {
+    "P": Light(TILE_SIZE * 2, (120, 100, 60)),  # Lamps along the paths
+}
+
+class LightMap:
+    """Light map multiplied over the world - tile lights are cached, lights that move are added each frame"""
+    _stamps = OrderedDict()  # (radius, color) -> gradient Surface (least recently used first)
+    stamp_capacity = LIGHT_STAMP_CACHE_SIZE
+
+    def __init__(self, scale=LIGHT_MAP_SCALE):
+        self.scale = scale  # View pixels per light map pixel
+        self.surface = None  # Low-resolution light map of the tile lights around the view
+        self.static = None  # Tile light map stretched to view pixels
+        self.static_area = None  # World rect the tile light map covers
+        self.static_key = None  # What the tile light map was built for
+        self.lit = None  # Ambient plus tile light, what the world is multiplied by
+        self.lit_ambient = None
+
+    @classmethod
+    def get_stamp(cls, radius, color):
+        """Get the shared radial gradient for a radius (in pixels) and color"""
+        key = (radius, color)
+        stamp = cls._stamps.get(key)
+        if stamp is None:
+            stamp = cls.render_stamp(radius, color)
+            cls._stamps[key] = stamp
+            if len(cls._stamps) > cls.stamp_capacity:
+                cls._stamps.popitem(last=False)
+        else:
+            cls._stamps.move_to_end(key)
+        return stamp
+
+    @staticmethod
+    def render_stamp(radius, color):
+        """Draw a radial gradient that fades from color to black at radius"""
+        offsets = np.arange(radius * 2) - radius + 0.5
+        distance = np.hypot(offsets[:, None], offsets[None, :]) / radius
+        falloff = np.clip(1 - distance, 0, 1) ** 2
+        pixels = (falloff[:, :, None] * np.array(color, dtype=np.float64)).astype(np.uint8)
+        return pygame.surfarray.make_surface(pixels)
+
+    @staticmethod
+    def ambient(tint, alpha):
+        """Light level that matches the flat overlay for a tint and alpha"""
+        strength = alpha / 255
+        return tuple(int(255 * (1 - strength) + channel * strength) for channel in tint)
+
+    def update_static(self, camera, world):
+        """Rebuild the tile light map if the view left its area or the world or scale changed"""
+        view = camera.rect
+        key = (camera.render_scale, id(world.grid), world.version)
+        if key == self.static_key and self.static_area.contains(view):
+            return
+        # Cover some room around the view so scrolling doesn't rebuild it every frame
+        area = view.inflate(view.width // 2, view.height // 2)
+        factor = camera.render_scale / self.scale
+        size = (max(1, int(area.width * factor)), max(1, int(area.height * factor)))
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+        self.surface.fill((0, 0, 0))
+
+        blits = []
+        for (x, y), light in self.tile_lights(world, area):
+            radius = max(1, int(light.radius * factor))
+            dest = (int((x - area.x) * factor) - radius, int((y - area.y) * factor) - radius)
+            blits.append((self.get_stamp(radius, light.color), dest, None, pygame.BLEND_RGB_ADD))
+        self.surface.blits(blits, doreturn=False)
+
+        # Rare, so it can afford a smooth stretch
+        static_size = (round(area.width * camera.render_scale), round(area.height * camera.render_scale))
+        if self.static is None or self.static.get_size() != static_size:
+            self.static = pygame.Surface(static_size)
+        pygame.transform.smoothscale(self.surface, static_size, self.static)
+        self.static_area = area
+        self.static_key = key
+        self.lit_ambient = None
+
+    def update_lit(self, ambient):
+        """Rebuild the ambient plus tile light map if either changed"""
+        if self.lit is None or self.lit.get_size() != self.static.get_size():
+            self.lit = pygame.Surface(self.static.get_size())
+        elif ambient == self.lit_ambient:
+            return
+        self.lit.fill(ambient)
+        self.lit.blit(self.static, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        self.lit_ambient = ambient
+
+    def draw(self, surface, camera, world, lights, tint, alpha):
+        """Light a view surface with the world's tile lights and a list of (world position, Light) that move"""
+        self.update_static(camera, world)
+        ambient = self.ambient(tint, alpha)
+        self.update_lit(ambient)
+
+        # The few lights that move are stamped on the cached map at full resolution...
+        scale = camera.render_scale
+        offset_x, offset_y = camera.apply_point(self.static_area.topleft)
+        blits = []
+        for pos, light in lights:
+            radius = max(1, int(light.radius * scale))
+            x, y = camera.apply_point(pos)
+            dest = (x - radius - offset_x, y - radius - offset_y)
+            blits.append((self.get_stamp(radius, light.color), dest, None, pygame.BLEND_RGB_ADD))
+        stamped = self.lit.blits(blits)
+        surface.blit(self.lit, (offset_x, offset_y), special_flags=pygame.BLEND_RGB_MULT)
+
+        # ...and taken back out once the world is lit
+        for rect in stamped:
+            self.lit.fill(ambient, rect)
+            self.lit.blit(self.static, rect, rect, pygame.BLEND_RGB_ADD)
+
+    @staticmethod
+    def tile_lights(world, view_rect):
+        """Lights of the tiles within (or near enough to light) a world rect"""
+        lights = []
+        for kind, light in TILE_LIGHTS.items():
+            area = view_rect.inflate(light.radius * 2, light.radius * 2)
+            start_x = max(0, area.left // TILE_SIZE)
+            start_y = max(0, area.top // TILE_SIZE)
+            end_x = min(world.width, area.right // TILE_SIZE + 1)
+            end_y = min(world.height, area.bottom // TILE_SIZE + 1)
+            if start_x >= end_x or start_y >= end_y:
+                continue
+
+            world.grid.ensure_loaded(start_x, start_y, end_x, end_y)
+            kinds = world.grid.kinds[start_y:end_y, start_x:end_x]
+            ys, xs = np.nonzero(kinds == KIND_CODES[kind])
+            half = TILE_SIZE // 2
+            for x, y in zip(((xs + start_x) * TILE_SIZE + half).tolist(), ((ys + start_y) * TILE_SIZE + half).tolist()):
+                lights.append(((x, y), light))
+        return lights
@@ -1,66 +1,106 @@
 import pygame
+import os
 import sys
 import json
+import time
+import argparse
 from settings import *
+from fonts import get_font
 from player import Player
 from inventory import Inventory
 from crafting import Crafting
 from world import World
 from animal import Animal
+from herd_store import HerdStore
+from spatial_hash import SpatialHash
+from game_clock import GameClock
 from npc import NPC
 from time_system import TimeSystem
 from ui import UI
 from plot_system import PlotSystem
+from camera import Camera
+from overlay import DayNightOverlay
+from lighting import LightMap
+from dirty_rects import DirtyTracker
+from tile_graphics import TileGraphics
+from tile_grid import KIND_CODES
 
 class FarmGame:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless  # Simulate only - no window and no drawing
+        if headless:
+            # Sprite sheets still need a display to load, so use SDL's dummy driver
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pygame.init()
-        self.screen = pygame.display.set_mode((DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT), 
-                                              pygame.RESIZABLE)
-        pygame.display.set_caption("Pixel Farm - Harvest Valley")
+        if headless:
+            self.screen = pygame.display.set_mode((1, 1))
+        else:
+            self.screen = pygame.display.set_mode((DEFAULT_SCREEN_WIDTH, DEFAULT_SCREEN_HEIGHT), 
+                                                  pygame.RESIZABLE)
+            pygame.display.set_caption("Pixel Farm - Harvest Valley")
         self.clock = pygame.time.Clock()
+        self.interpolation = 1  # How far rendering is between the last two simulation steps
         
         # Track current window size
         self.screen_width = DEFAULT_SCREEN_WIDTH
         self.screen_height = DEFAULT_SCREEN_HEIGHT
         
-        # Create world surface (fixed size for game world)
-        self.world_width = TILE_SIZE * MAP_WIDTH
-        self.world_height = TILE_SIZE * MAP_HEIGHT
-        self.world_surface = pygame.Surface((self.world_width, self.world_height))
+        # Game time shared by everything with timers (stands still while paused)
+        self.game_clock = GameClock()
+        self.notification_timer = self.game_clock.timer()
+        
+        # Game world
+        self.world = World(self.game_clock)
+        self.world.create_default_map()
+        self.world_width = TILE_SIZE * self.world.width
+        self.world_height = TILE_SIZE * self.world.height
+        
+        # Camera - only the part of the world in view is drawn to the world surface
+        self.camera = Camera(self.world_width, self.world_height)
+        self.camera.resize(self.screen_width, self.screen_height)
+        self.create_world_surface()
         
         # Game objects
         self.player = Player((self.world_width // 2, self.world_height // 2))
-        self.world = World()
-        self.world.create_default_map()
+        self.player.bounds = pygame.Rect(0, 0, self.world_width, self.world_height)
+        self.camera.follow(self.player.rect.center)
+        
+        # NPCs and animals are filed in a spatial hash for proximity lookups
+        self.entities = SpatialHash()
         
-        # Animals
+        # Animals - simulated together by the herd, the sprites are views of it
+        self.herd = HerdStore(bounds=(self.world_width, self.world_height), index=self.entities,
+                              clock=self.game_clock)
         self.animals = pygame.sprite.Group()
-        self.animals.add(Animal((300, 300), "chicken"))
-        self.animals.add(Animal((350, 320), "chicken"))
-        self.animals.add(Animal((500, 400), "cow"))
+        self.animals.add(Animal((300, 300), "chicken", self.herd))
+        self.animals.add(Animal((350, 320), "chicken", self.herd))
+        self.animals.add(Animal((500, 400), "cow", self.herd))
         
         # NPCs
         self.npcs = pygame.sprite.Group()
-        self.shopkeeper = NPC((100, 150), "shopkeeper")
-        self.mayor = NPC((self.world_width - 100, 150), "mayor")
+        self.shopkeeper = NPC((100, 150), "shopkeeper", self.game_clock)
+        self.mayor = NPC((self.world_width - 100, 150), "mayor", self.game_clock)
         self.npcs.add(self.shopkeeper, self.mayor)
+        for npc in self.npcs:
+            self.entities.insert(npc, npc.rect.center, "npc")
         
         # Show welcome message
         self.show_notification("Welcome! Press F near Shopkeeper to trade!")
-        self.notification_timer = 300
+        self.notification_timer.start(300)
         
         # Systems
         self.inventory = Inventory()
         self.crafting = Crafting()
         self.time_system = TimeSystem()
+        self.day_night = DayNightOverlay()
+        self.light_map = LightMap()
+        self.dirty = DirtyTracker()
         self.ui = UI()
-        self.plot_system = PlotSystem()
+        self.plot_system = PlotSystem(self.world.width, self.world.height)
         
         # Game state
         self.show_grid = False
         self.notification = ""
-        self.notification_timer = 0
         self.paused = False
         
         # Interaction
@@ -68,7 +108,7 @@ class FarmGame:
         self.nearby_animal = None
         self.interaction_distance = 60
         
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
         
         # Settings button rect
         self.settings_button_rect = None
@@ -82,43 +122,45 @@ class FarmGame:
         # Update global settings
         update_screen_size(self.screen_width, self.screen_height)
         
+        # Fit the camera to the new window (the view may show more or less world)
+        self.camera.resize(self.screen_width, self.screen_height)
+        self.camera.follow(self.player.rect.center)
+        self.create_world_surface()
+        self.prescale_sprites()
+        self.dirty.invalidate()
+        
+    def create_world_surface(self):
+        """Create the surface the world view is drawn to"""
+        if self.headless:
+            self.world_surface = None
+        elif self.camera.native:
+            # Draw straight onto the window at native resolution
+            self.world_surface = self.screen.subsurface(self.camera.screen_rect)
+        else:
+            # Draw at 1:1 and scale the whole frame when presenting it
+            self.world_surface = pygame.Surface(self.camera.rect.size)
+            
+    def prescale_sprites(self):
+        """Scale the art in use to the current render scale ahead of drawing"""
+        if not self.camera.native:
+            return
+        images = [TileGraphics.get(kind) for kind in KIND_CODES]
+        images.append(TileGraphics.get("S", True))
+        images.extend(crop.image for crop in self.world.crops)
+        images.extend(Animal.get_image(animal_type) for animal_type in Animal.ANIMAL_TYPES)
+        images.extend(npc.image for npc in self.npcs)
+        for frames in (self.player.idle_frames, self.player.walk_frames):
+            for direction_frames in frames.values():
+                images.extend(direction_frames)
+        self.camera.sprites.prescale(images)
+        
     def screen_to_world_pos(self, screen_pos):
         """Convert screen position to world position"""
-        # Calculate scale to fit world in window
-        scale_x = self.screen_width / self.world_width
-        scale_y = self.screen_height / self.world_height
-        scale = min(scale_x, scale_y)
-        
-        # Calculate scaled dimensions and offset
-        scaled_width = int(self.world_width * scale)
-        scaled_height = int(self.world_height * scale)
-        offset_x = (self.screen_width - scaled_width) // 2
-        offset_y = (self.screen_height - scaled_height) // 2
-        
-        # Adjust for world offset
-        adjusted_x = screen_pos[0] - offset_x
-        adjusted_y = screen_pos[1] - offset_y
-        
-        # Scale to world coordinates
-        world_x = adjusted_x / scale
-        world_y = adjusted_y / scale
-        
-        return (int(world_x), int(world_y))
+        return self.camera.screen_to_world(screen_pos)
     
     def is_click_in_world(self, screen_pos):
         """Check if a screen position is within the world area"""
-        scale_x = self.screen_width / self.world_width
-        scale_y = self.screen_height / self.world_height
-        scale = min(scale_x, scale_y)
-        
-        scaled_width = int(self.world_width * scale)
-        scaled_height = int(self.world_height * scale)
-        offset_x = (self.screen_width - scaled_width) // 2
-        offset_y = (self.screen_height - scaled_height) // 2
-        
-        x, y = screen_pos
-        return (offset_x <= x < offset_x + scaled_width and
-                offset_y <= y < offset_y + scaled_height)
+        return self.camera.is_on_screen(screen_pos)
         
     def handle_events(self):
         """Handle all game events"""
@@ -246,28 +288,21 @@ class FarmGame:
                             if success or message:
                                 self.show_notification(message)
     
+    def visible_animals(self):
+        """Animals in view (or close enough for their status icons to show), rects synced"""
+        return self.herd.visible(self.camera.rect.inflate(TILE_SIZE * 2, TILE_SIZE * 2))
+    
     def check_nearby_entities(self):
         """Check for nearby NPCs and animals for F key interaction"""
-        player_pos = pygame.math.Vector2(self.player.rect.center)
+        player_pos = self.player.rect.center
         
         # Check NPCs
-        self.nearby_npc = None
-        for npc in self.npcs:
-            npc_pos = pygame.math.Vector2(npc.rect.center)
-            distance = player_pos.distance_to(npc_pos)
-            if distance <= self.interaction_distance:
-                self.nearby_npc = npc
-                break
+        self.nearby_npc = self.entities.nearest(player_pos, self.interaction_distance, "npc")
         
         # Check animals (only if no NPC nearby)
         self.nearby_animal = None
         if not self.nearby_npc:
-            for animal in self.animals:
-                animal_pos = pygame.math.Vector2(animal.rect.center)
-                distance = player_pos.distance_to(animal_pos)
-                if distance <= self.interaction_distance:
-                    self.nearby_animal = animal
-                    break
+            self.nearby_animal = self.entities.nearest(player_pos, self.interaction_distance, "animal")
     
     def interact_with_npc(self, npc):
         """Interact with an NPC"""
@@ -349,17 +384,20 @@ class FarmGame:
     def show_notification(self, message):
         """Show a notification message"""
         self.notification = message
-        self.notification_timer = 120
+        self.notification_timer.start(120)
         
     def update(self, dt):
         """Update all game systems"""
         if self.paused:
             return
             
+        self.game_clock.advance(dt)
         keys = pygame.key.get_pressed()
         
         # Update systems
         self.player.update(keys, dt)
+        self.camera.follow(self.player.rect.center)
+        self.world.stream_chunks(self.player.rect.center, self.camera.rect)
         self.world.update()
         self.time_system.update(dt)
         
@@ -367,100 +405,176 @@ class FarmGame:
         self.check_nearby_entities()
         
         # Update animals
-        for animal in self.animals:
-            animal.update(dt)
+        self.herd.update(dt, self.camera.rect)
             
         # Update NPCs
         for npc in self.npcs:
             npc.update(dt)
             
         # Update notification
-        if self.notification_timer > 0:
-            self.notification_timer -= 1
-            if self.notification_timer == 0:
-                self.notification = ""
+        if self.notification and self.notification_timer.done:
+            self.notification = ""
                 
     def draw(self):
-        """Draw everything"""
+        """Draw everything, or only what changed since the last frame"""
+        # The view follows the player's interpolated position, so scrolling stays smooth between steps
+        self.camera.follow(self.player.draw_rect(self.interpolation).center)
+        dirty_rects = self.find_dirty_rects()
+        if dirty_rects is None:
+            self.draw_frame()
+            pygame.display.flip()
+        elif dirty_rects:
+            # Repaint just the changed area and push only the changed rects. The
+            # clip gets a margin because thick lines whose centre falls outside
+            # the clip are skipped entirely, leaving the edge rows unpainted
+            area = dirty_rects[0].unionall(dirty_rects[1:]).inflate(8, 8)
+            self.screen.set_clip(area)
+            self.world_surface.set_clip(area.move(-self.camera.screen_rect.x, -self.camera.screen_rect.y))
+            self.draw_frame()
+            self.screen.set_clip(None)
+            self.world_surface.set_clip(None)
+            pygame.display.update(dirty_rects)
+            
+    def find_dirty_rects(self):
+        """Screen rects that changed since the last frame, or None to redraw everything"""
+        changed_tiles = self.world.changed_tiles
+        self.world.changed_tiles = []
+        
+        camera = self.camera
+        # Menus cover most of the window, and without native rendering the
+        # whole view is rescaled every frame anyway
+        if (not DIRTY_RECTS or not camera.native or self.inventory.show_full_inventory
+                or self.crafting.show_menu or self.shopkeeper.shop_mode):
+            self.dirty.invalidate()
+            return None
+            
+        # Changes to any of these redraw the whole window
+        tint, alpha = self.time_system.get_lighting()
+        lights = None
+        if LIGHTING and alpha:
+            # Tile lights only change with the view or the world
+            lights = (self.world.version, tuple((pos, id(light)) for pos, light in self.visible_lights()))
+        scene = (camera.rect.topleft, tuple(camera.screen_rect), tint, alpha, lights, self.show_grid,
+                 self.plot_system.version, self.ui.show_controls, self.notification)
+        self.dirty.begin(scene)
+        
+        interpolation = self.interpolation
+        offset_x, offset_y = camera.screen_rect.topleft
+        def screen_rect(world_rect):
+            return camera.apply(world_rect).move(offset_x, offset_y)
+        
+        # Tiles that were tilled or watered
+        for grid_x, grid_y in changed_tiles:
+            self.dirty.mark(screen_rect(pygame.Rect(grid_x * TILE_SIZE, grid_y * TILE_SIZE, TILE_SIZE, TILE_SIZE)))
+            
+        # Moving or changing sprites, with room for their status icons and labels
+        for crop in self.world.visible_crops(camera.rect):
+            self.dirty.track(crop, screen_rect(crop.rect.inflate(8, 24)),
+                             (crop.image, crop.needs_water, crop.ready_to_harvest))
+        for animal in self.visible_animals():
+            self.dirty.track(animal, screen_rect(animal.draw_rect(interpolation).inflate(16, 48)),
+                             (animal.image, animal.state))
+        for npc in self.npcs:
+            if camera.is_visible(npc.rect, TILE_SIZE * 3):
+                self.dirty.track(npc, screen_rect(npc.rect.inflate(TILE_SIZE * 10, TILE_SIZE * 6)),
+                                 (npc.dialogue_visible, npc.current_dialogue))
+        self.dirty.track(self.player, screen_rect(self.player.draw_rect(interpolation)), self.player.image)
+        
+        prompt = self.get_interaction_prompt()
+        if prompt:
+            x, y, text = prompt
+            self.dirty.track("prompt", self.interaction_prompt_rect(x, y, text).move(offset_x, offset_y), text)
+            
+        # Plot hint under the mouse
+        screen_mouse_pos = pygame.mouse.get_pos()
+        if self.is_click_in_world(screen_mouse_pos):
+            world_x, world_y = self.screen_to_world_pos(screen_mouse_pos)
+            grid_pos = (world_x // TILE_SIZE, world_y // TILE_SIZE)
+            tile = screen_rect(pygame.Rect(grid_pos[0] * TILE_SIZE, grid_pos[1] * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+            self.dirty.track("hint", pygame.Rect(tile.centerx - 200, tile.y - 30, 400, tile.height + 30),
+                             (grid_pos, self.player.version, self.world.version))
+            
+        # HUD panels
+        self.dirty.track("stats", pygame.Rect(10, 10, 250, 120), (self.player.version, self.time_system.version))
+        hotbar_width = 64 * 5 + 8 * 4
+        self.dirty.track("hotbar", pygame.Rect((self.screen_width - hotbar_width) // 2, self.screen_height - 84,
+                                               hotbar_width, 64),
+                         (self.inventory.items.version, tuple(self.inventory.hotbar),
+                          self.inventory.selected_hotbar_slot))
+        
+        return self.dirty.end(self.screen.get_rect())
+        
+    def draw_frame(self):
+        """Draw the whole frame (limited to the clip area, if one is set)"""
         # Clear screen with black
         self.screen.fill(BLACK)
         
-        # Draw world to world surface
+        # Draw the part of the world in view to the world surface
+        camera = self.camera
         self.world_surface.fill(BLACK)
-        self.world.tiles.draw(self.world_surface)
+        self.world.draw_terrain(self.world_surface, camera)
         
         # Draw claimed plot indicators
-        self.plot_system.draw_claimed_indicators(self.world_surface)
+        self.plot_system.draw_claimed_indicators(self.world_surface, camera)
         
         # Draw grid if enabled
         if self.show_grid:
-            self.world.draw_grid(self.world_surface)
+            self.world.draw_grid(self.world_surface, camera)
             
-        # Draw crops
-        self.world.crops.draw(self.world_surface)
-        
-        # Draw crop status indicators
-        for crop in self.world.crops:
-            crop.draw_status(self.world_surface)
-        
-        # Draw animals
-        self.animals.draw(self.world_surface)
-        for animal in self.animals:
-            animal.draw_status(self.world_surface)
+        # Draw crops and their status indicators
+        crops = self.world.visible_crops(camera.rect)
+        self.world_surface.blits([(camera.image(crop.image), camera.apply(crop.rect)) for crop in crops],
+                                 doreturn=False)
+        for crop in crops:
+            crop.draw_status(self.world_surface, camera)
+        
+        # Draw animals (status icons sit above the sprite, so keep a margin)
+        # Sprites that move are drawn between their last two simulation positions
+        interpolation = self.interpolation
+        animals = self.visible_animals()
+        for animal in animals:
+            self.world_surface.blit(camera.image(animal.image), camera.apply(animal.draw_rect(interpolation)))
+        for animal in animals:
+            animal.draw_status(self.world_surface, camera, interpolation)
             
-        # Draw NPCs
-        self.npcs.draw(self.world_surface)
-        for npc in self.npcs:
-            npc.draw_label(self.world_surface)
-            npc.draw_dialogue(self.world_surface)
+        # Draw NPCs (labels and dialogue extend further than the sprite)
+        npcs = [npc for npc in self.npcs if camera.is_visible(npc.rect, TILE_SIZE * 3)]
+        for npc in npcs:
+            self.world_surface.blit(camera.image(npc.image), camera.apply(npc.rect))
+        for npc in npcs:
+            npc.draw_label(self.world_surface, camera)
+            npc.draw_dialogue(self.world_surface, camera)
             
         # Draw player
-        self.world_surface.blit(self.player.image, self.player.rect)
+        self.world_surface.blit(camera.image(self.player.image), camera.apply(self.player.draw_rect(interpolation)))
         
         # Draw interaction prompt (in world space)
-        if self.nearby_npc:
-            self.draw_interaction_prompt_world(self.world_surface, 
-                                              self.nearby_npc.rect.centerx, 
-                                              self.nearby_npc.rect.top - 30, 
-                                              f"Press [F] to talk to {self.nearby_npc.npc_type.title()}")
-        elif self.nearby_animal:
-            if self.nearby_animal.can_collect():
-                action = "Collect"
-            elif self.nearby_animal.can_feed():
-                action = "Feed"
-            else:
-                action = "Check"
-            self.draw_interaction_prompt_world(self.world_surface,
-                                              self.nearby_animal.rect.centerx, 
-                                              self.nearby_animal.rect.top - 30,
-                                              f"Press [F] to {action}")
+        prompt = self.get_interaction_prompt()
+        if prompt:
+            self.draw_interaction_prompt_world(self.world_surface, *prompt)
         
         # Draw claimable/sellable plot hint (only if inventory not open) - in world space
         if not self.inventory.show_full_inventory:
             screen_mouse_pos = pygame.mouse.get_pos()
             if self.is_click_in_world(screen_mouse_pos):
                 world_mouse_pos = self.screen_to_world_pos(screen_mouse_pos)
-                self.plot_system.draw_claimable_hint(self.world_surface, world_mouse_pos, self.world, self.player)
+                self.plot_system.draw_claimable_hint(self.world_surface, world_mouse_pos, self.world, self.player, camera)
         
-        # Apply darkness for night
-        if self.time_system.is_night():
-            darkness = pygame.Surface((self.world_width, self.world_height))
-            darkness.set_alpha(self.time_system.get_darkness_alpha())
-            darkness.fill((0, 0, 40))
-            self.world_surface.blit(darkness, (0, 0))
-        
-        # Scale world to fill window while maintaining aspect ratio
-        scale_x = self.screen_width / self.world_width
-        scale_y = self.screen_height / self.world_height
-        scale = min(scale_x, scale_y)
-        
-        scaled_width = int(self.world_width * scale)
-        scaled_height = int(self.world_height * scale)
-        offset_x = (self.screen_width - scaled_width) // 2
-        offset_y = (self.screen_height - scaled_height) // 2
+        # Apply the day/night tint (dawn, dusk and night), lit by nearby lights
+        tint, alpha = self.time_system.get_lighting()
+        if LIGHTING and alpha:
+            self.light_map.draw(self.world_surface, camera, self.world, self.visible_lights(), tint, alpha)
+        else:
+            self.day_night.draw(self.world_surface, tint, alpha)
         
-        scaled_surface = pygame.transform.scale(self.world_surface, (scaled_width, scaled_height))
-        self.screen.blit(scaled_surface, (offset_x, offset_y))
+        # Scale the view to fill the window while maintaining aspect ratio
+        # (in native mode the view was already drawn straight to the window)
+        if not camera.native:
+            if camera.screen_rect.size == self.world_surface.get_size():
+                self.screen.blit(self.world_surface, camera.screen_rect)
+            else:
+                scaled_surface = pygame.transform.scale(self.world_surface, camera.screen_rect.size)
+                self.screen.blit(scaled_surface, camera.screen_rect)
         
         # Draw UI elements (screen space)
         self.ui.draw_player_stats(self.screen, self.player, self.time_system)
@@ -485,20 +599,51 @@ class FarmGame:
         # Draw settings button (always on top)
         self.settings_button_rect = self.ui.draw_settings_button(self.screen, self.screen_width, self.screen_height)
             
-        # Update display
-        pygame.display.flip()
+    def get_interaction_prompt(self):
+        """View position and text of the interaction prompt, if one is shown"""
+        camera = self.camera
+        if self.nearby_npc:
+            x, y = camera.apply_point((self.nearby_npc.rect.centerx, self.nearby_npc.rect.top - 30))
+            return x, y, f"Press [F] to talk to {self.nearby_npc.npc_type.title()}"
+        elif self.nearby_animal:
+            if self.nearby_animal.can_collect():
+                action = "Collect"
+            elif self.nearby_animal.can_feed():
+                action = "Feed"
+            else:
+                action = "Check"
+            rect = self.nearby_animal.draw_rect(self.interpolation)
+            x, y = camera.apply_point((rect.centerx, rect.top - 30))
+            return x, y, f"Press [F] to {action}"
+        return None
+    
+    def interaction_prompt_rect(self, x, y, text):
+        """Area covered by an interaction prompt"""
+        padding = 6
+        text_width, text_height = get_font(18).size(text)
+        bg_width = text_width + padding * 2
+        bg_height = text_height + padding * 2
+        return pygame.Rect(x - bg_width // 2, y, bg_width, bg_height)
+    
+    def visible_lights(self):
+        """Lights carried by the player and NPCs that are close enough to the view to light it"""
+        view = self.camera.rect
+        lights = []
+        positions = [(self.player.draw_rect(self.interpolation).center, self.player.light)]
+        positions.extend((npc.rect.center, npc.light) for npc in self.npcs)
+        for pos, light in positions:
+            if view.inflate(light.radius * 2, light.radius * 2).collidepoint(pos):
+                lights.append((pos, light))
+        return lights
     
     def draw_interaction_prompt_world(self, surface, x, y, text):
         """Draw interaction prompt in world space"""
-        prompt_font = pygame.font.Font(None, 18)
+        prompt_font = get_font(18)
         text_surface = prompt_font.render(text, True, WHITE)
         
         # Background
         padding = 6
-        bg_width = text_surface.get_width() + padding * 2
-        bg_height = text_surface.get_height() + padding * 2
-        bg_x = x - bg_width // 2
-        bg_y = y
+        bg_x, bg_y, bg_width, bg_height = self.interaction_prompt_rect(x, y, text)
         
         bg = pygame.Surface((bg_width, bg_height))
         bg.set_alpha(220)
@@ -563,6 +708,7 @@ class FarmGame:
             
             # Restore plots
             if "plots" in save_data:
+                self.plot_system.resize(self.world.width, self.world.height)
                 self.plot_system.load_data(save_data["plots"])
             
             print("Game loaded!")
@@ -579,13 +725,55 @@ class FarmGame:
         # Try to load save
         self.load_game()
         
+        # Simulate in fixed steps and draw as often as the display allows,
+        # interpolating sprites between the last two steps
+        step = 1 / SIM_RATE  # Seconds per simulation step
+        step_dt = 60 * step  # Game clock ticks per step (a tick is a 60 FPS frame)
+        accumulator = 0
         while True:
-            dt = self.clock.tick(FPS) / 16.67
+            accumulator += self.clock.tick(FPS) / 1000
             
             self.handle_events()
-            self.update(dt)
+            steps = 0
+            while accumulator >= step and steps < MAX_SIM_STEPS:
+                self.update(step_dt)
+                accumulator -= step
+                steps += 1
+            if steps == MAX_SIM_STEPS:
+                # Too far behind to catch up - drop the backlog rather than spiral
+                accumulator = min(accumulator, step)
+                
+            self.interpolation = accumulator / step
             self.draw()
+            
+    def simulate(self, updates=None, days=None, dt=1):
+        """Step the game as fast as possible for a number of updates or in-game days, return (updates, seconds)"""
+        end_day = None if days is None else self.time_system.day + days
+        count = 0
+        start = time.perf_counter()
+        while ((updates is None or count < updates) and
+               (end_day is None or self.time_system.day < end_day)):
+            self.update(dt)
+            count += 1
+        return count, time.perf_counter() - start
 
 if __name__ == "__main__":
-    game = FarmGame()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pixel Farm - Harvest Valley")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window as fast as possible and report updates per second")
+    parser.add_argument("--updates", type=int, help="headless: number of updates to run")
+    parser.add_argument("--days", type=int, help="headless: number of in-game days to run (default 1)")
+    parser.add_argument("--dt", type=float, default=1,
+                        help="headless: game ticks each update advances (a tick is a 60 FPS frame) - animals take the same paths at any step")
+    args = parser.parse_args()
+    
+    if args.headless:
+        game = FarmGame(headless=True)
+        days = 1 if args.updates is None and args.days is None else args.days
+        updates, seconds = game.simulate(args.updates, days, args.dt)
+        print(f"{updates} updates ({game.game_clock.now:.0f} game ticks) in {seconds:.2f}s "
+              f"({updates / max(seconds, 1e-9):.0f} updates/s), "
+              f"day {game.time_system.day}, {game.time_system.season}")
+    else:
+        game = FarmGame()
+        game.run()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import struct
+import sys
+import numpy as np
+from settings import CHUNK_SIZE
+from tile_grid import TileGrid, EMPTY
+
+# Binary map layout (little endian):
+#   header      - magic, version, width, height, chunk size
+#   chunk index - one uint64 file offset per chunk, row by row
+#   chunk data  - chunk_size * chunk_size uint8 kind codes per chunk,
+#                 padded with EMPTY past the map edge
+MAGIC = b"FARMMAP1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+
+def write_map(path, kinds, chunk_size=CHUNK_SIZE):
+    """Write a 2D array of kind codes as a binary map"""
+    height, width = kinds.shape
+    chunks_x = (width + chunk_size - 1) // chunk_size
+    chunks_y = (height + chunk_size - 1) // chunk_size
+
+    # Pad to whole chunks, then reorder so every chunk is contiguous
+    padded = np.full((chunks_y * chunk_size, chunks_x * chunk_size), EMPTY, dtype=np.uint8)
+    padded[:height, :width] = kinds
+    chunk_data = padded.reshape(chunks_y, chunk_size, chunks_x, chunk_size).transpose(0, 2, 1, 3)
+
+    data_start = HEADER.size + chunks_x * chunks_y * 8
+    chunk_bytes = chunk_size * chunk_size
+    index = data_start + np.arange(chunks_x * chunks_y, dtype=np.uint64) * chunk_bytes
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, chunk_size))
+        f.write(index.astype("<u8").tobytes())
+        f.write(np.ascontiguousarray(chunk_data).tobytes())
+
+def convert_text_map(src, dst, chunk_size=CHUNK_SIZE):
+    """Convert a text map (one character per tile) to the binary format"""
+    with open(src) as f:
+        rows = [row.strip() for row in f]
+    grid = TileGrid.from_rows(rows)
+    write_map(dst, grid.kinds, chunk_size)
+    return grid.width, grid.height
+
+def is_map_file(path):
+    """Check if a file starts with the binary map magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+class MapFile:
+    """Memory-mapped binary map - chunks are paged in only when read"""
+
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+
+        magic, version, width, height, chunk_size = HEADER.unpack(bytes(self.data[:HEADER.size]))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary map")
+        if version != VERSION:
+            raise ValueError(f"Unsupported map version {version} in {path}")
+
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunks_x = (width + chunk_size - 1) // chunk_size
+        self.chunks_y = (height + chunk_size - 1) // chunk_size
+
+        index_end = HEADER.size + self.chunks_x * self.chunks_y * 8
+        self.index = self.data[HEADER.size:index_end].view("<u8").reshape(self.chunks_y, self.chunks_x)
+
+    def read_chunk(self, chunk_x, chunk_y):
+        """Kind codes of one chunk as a (chunk_size, chunk_size) array"""
+        offset = int(self.index[chunk_y, chunk_x])
+        size = self.chunk_size * self.chunk_size
+        return self.data[offset:offset + size].reshape(self.chunk_size, self.chunk_size)
+
+def main(args):
+    """Convert text maps: map_format.py [src.txt dst.bin] (defaults to the game's maps)"""
+    if len(args) == 2:
+        pairs = [(args[0], args[1])]
+    else:
+        pairs = [(name, os.path.splitext(name)[0] + ".bin") for name in ("map.txt", "house_map.txt")]
+
+    for src, dst in pairs:
+        width, height = convert_text_map(src, dst)
+        print(f"{src} -> {dst} ({width}x{height})")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
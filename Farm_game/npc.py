@@ -1,6 +1,9 @@
 import pygame
 from settings import *
+from fonts import get_font
 from crop import Crop
+from lighting import Light
+from game_clock import GameClock
 
 class NPC(pygame.sprite.Sprite):
     NPC_DATA = {
@@ -12,7 +15,8 @@ class NPC(pygame.sprite.Sprite):
                 "Fresh supplies daily!",
                 "How's the farm going?"
             ],
-            "shop": True
+            "shop": True,
+            "light": (TILE_SIZE * 4, (255, 190, 110))  # Shop lantern
         },
         "mayor": {
             "color": (50, 50, 150),
@@ -22,7 +26,8 @@ class NPC(pygame.sprite.Sprite):
                 "Keep up the good work!",
                 "We're proud of our farmers!"
             ],
-            "shop": False
+            "shop": False,
+            "light": (TILE_SIZE * 3, (230, 200, 150))
         },
         "fisherman": {
             "color": (100, 150, 200),
@@ -32,11 +37,12 @@ class NPC(pygame.sprite.Sprite):
                 "I caught a big one yesterday!",
                 "The lake is beautiful this time of year."
             ],
-            "shop": False
+            "shop": False,
+            "light": (TILE_SIZE * 3, (170, 200, 230))
         }
     }
     
-    def __init__(self, pos, npc_type="shopkeeper"):
+    def __init__(self, pos, npc_type="shopkeeper", clock=None):
         super().__init__()
         
         self.npc_type = npc_type
@@ -47,13 +53,16 @@ class NPC(pygame.sprite.Sprite):
         self.create_sprite()
         
         self.rect = self.image.get_rect(center=pos)
+        self.light = Light(*self.data["light"])
         
         # Dialogue
         self.current_dialogue = 0
         self.dialogue_visible = False
-        self.dialogue_timer = 0
-        self.font = pygame.font.Font(None, 18)
-        self.title_font = pygame.font.Font(None, 24)
+        self.own_clock = clock is None  # A private game clock is advanced by update
+        self.clock = GameClock() if clock is None else clock
+        self.dialogue_timer = self.clock.timer()
+        self.font = get_font(18)
+        self.title_font = get_font(24)
         
         # Shop state
         self.shop_mode = None  # None, 'menu', 'buy', or 'sell'
@@ -89,19 +98,19 @@ class NPC(pygame.sprite.Sprite):
             return "Hello! What can I do for you today?"
         else:
             self.dialogue_visible = True
-            self.dialogue_timer = 180  # Show for 3 seconds at 60 FPS
+            self.dialogue_timer.start(180)  # Show for 3 seconds
             dialogue = self.data["dialogues"][self.current_dialogue]
             self.current_dialogue = (self.current_dialogue + 1) % len(self.data["dialogues"])
             return dialogue
         
     def update(self, dt):
         """Update NPC"""
-        if self.dialogue_visible:
-            self.dialogue_timer -= 1
-            if self.dialogue_timer <= 0:
-                self.dialogue_visible = False
+        if self.own_clock:
+            self.clock.advance(dt)
+        if self.dialogue_visible and self.dialogue_timer.done:
+            self.dialogue_visible = False
                 
-    def draw_dialogue(self, surface):
+    def draw_dialogue(self, surface, camera):
         """Draw dialogue bubble"""
         if self.dialogue_visible and self.npc_type != "shopkeeper":
             dialogue = self.data["dialogues"][self.current_dialogue - 1]
@@ -113,13 +122,12 @@ class NPC(pygame.sprite.Sprite):
             box_height = text_surface.get_height() + padding * 2
             
             # Position above NPC
-            box_x = self.rect.centerx - box_width // 2
-            box_y = self.rect.top - box_height - 10
+            center_x, top = camera.apply_point(self.rect.midtop)
+            box_x = center_x - box_width // 2
+            box_y = top - box_height - 10
             
-            # Keep on screen (use world surface dimensions)
-            world_width = TILE_SIZE * MAP_WIDTH
-            world_height = TILE_SIZE * MAP_HEIGHT
-            box_x = max(5, min(box_x, world_width - box_width - 5))
+            # Keep on screen (use view surface dimensions)
+            box_x = max(5, min(box_x, surface.get_width() - box_width - 5))
             box_y = max(5, box_y)
             
             # Draw box
@@ -128,9 +136,9 @@ class NPC(pygame.sprite.Sprite):
             
             # Draw pointer
             points = [
-                (self.rect.centerx, self.rect.top - 5),
-                (self.rect.centerx - 5, box_y + box_height),
-                (self.rect.centerx + 5, box_y + box_height)
+                (center_x, top - 5),
+                (center_x - 5, box_y + box_height),
+                (center_x + 5, box_y + box_height)
             ]
             pygame.draw.polygon(surface, WHITE, points)
             pygame.draw.lines(surface, BLACK, True, points, 2)
@@ -138,17 +146,18 @@ class NPC(pygame.sprite.Sprite):
             # Draw text
             surface.blit(text_surface, (box_x + padding, box_y + padding))
             
-    def draw_label(self, surface):
+    def draw_label(self, surface, camera):
         """Draw name label above NPC"""
         if self.npc_type == "shopkeeper":
-            label_font = pygame.font.Font(None, 16)
+            label_font = get_font(16)
             label = label_font.render("SHOP", True, (255, 215, 0))
             label_bg = pygame.Surface((label.get_width() + 6, label.get_height() + 4))
             label_bg.fill((0, 0, 0))
             label_bg.set_alpha(180)
             
-            label_x = self.rect.centerx - label.get_width() // 2 - 3
-            label_y = self.rect.top - 20
+            center_x, top = camera.apply_point(self.rect.midtop)
+            label_x = center_x - label.get_width() // 2 - 3
+            label_y = top - 20
             
             surface.blit(label_bg, (label_x, label_y))
             surface.blit(label, (label_x + 3, label_y + 2))
@@ -0,0 +1,37 @@
+import pygame
+from collections import OrderedDict
+from settings import *
+
+class DayNightOverlay:
+    """Reusable full-view tint surfaces keyed by (tint, quantized alpha)"""
+
+    def __init__(self, capacity=OVERLAY_CACHE_SIZE):
+        self.capacity = capacity
+        self.size = None  # Size of the cached surfaces
+        self._surfaces = OrderedDict()  # (tint, alpha) -> Surface (least recently used first)
+
+    def get(self, size, tint, alpha):
+        """Get an overlay surface for a tint and alpha"""
+        if size != self.size:
+            self._surfaces.clear()
+            self.size = size
+
+        key = (tint, alpha)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if len(self._surfaces) >= self.capacity:
+                # Recycle the least recently used surface instead of allocating
+                _, surface = self._surfaces.popitem(last=False)
+            else:
+                surface = pygame.Surface(size)
+            surface.fill(tint)
+            surface.set_alpha(alpha)
+            self._surfaces[key] = surface
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def draw(self, surface, tint, alpha):
+        """Tint a surface (nothing to do in full daylight)"""
+        if alpha > 0:
+            surface.blit(self.get(surface.get_size(), tint, alpha), (0, 0))
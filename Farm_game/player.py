@@ -1,6 +1,8 @@
 import pygame
 import os
 from settings import *
+from lighting import Light
+from versioning import Versioned
 
 def import_sheet(path, frame_width, frame_height, scale=2):
     """Slices and resizes frames from the sprite sheet."""
@@ -35,10 +37,16 @@ def import_sheet(path, frame_width, frame_height, scale=2):
     return animation_data
 
 class Player(pygame.sprite.Sprite):
+    # Stats shown on the HUD - every change bumps self.version
+    money = Versioned()
+    energy = Versioned(int)  # The energy bar only shows whole points
+    current_tool = Versioned()
+    
     def __init__(self, pos):
         super().__init__()
+        self.version = 0
         
-        asset_folder = "assets\Character"
+        asset_folder = os.path.join("assets", "Character")
         
         # Load both animation sets
         self.idle_frames = import_sheet(os.path.join(asset_folder, 'Idle.png'), 32, 32, 2)
@@ -53,7 +61,9 @@ class Player(pygame.sprite.Sprite):
         # Image and Rect
         self.image = self.idle_frames[self.facing][self.frame_index]
         self.rect = self.image.get_rect(center=pos)
+        self.previous_center = self.rect.center  # Position at the previous simulation step
         self.hitbox = self.rect.inflate(-20, -20)
+        self.light = Light(TILE_SIZE * 3)  # Lantern carried at night
         
         # Attributes (Restored for UI compatibility)
         self.speed = 3
@@ -61,6 +71,9 @@ class Player(pygame.sprite.Sprite):
         self.money = INITIAL_MONEY
         self.energy = 100
         self.max_energy = 100
+        
+        # Area the player can walk in (set to the world size by the game)
+        self.bounds = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
 
     def animate(self, dt):
         # Determine which sheet to use
@@ -81,18 +94,21 @@ class Player(pygame.sprite.Sprite):
         dx, dy = 0, 0
         
         # Movement and Facing logic
+        self.previous_center = self.rect.center
+        speed = self.speed * dt  # Speed is per tick, so the step rate doesn't change how fast we walk
+        
         if keys[pygame.K_w] or keys[pygame.K_UP]: 
-            dy -= self.speed
+            dy -= speed
             self.facing = 'up'
         elif keys[pygame.K_s] or keys[pygame.K_DOWN]: 
-            dy += self.speed
+            dy += speed
             self.facing = 'down'
             
         if keys[pygame.K_a] or keys[pygame.K_LEFT]: 
-            dx -= self.speed
+            dx -= speed
             self.facing = 'left'
         elif keys[pygame.K_d] or keys[pygame.K_RIGHT]: 
-            dx += self.speed
+            dx += speed
             self.facing = 'right'
             
         # Update status: MUST be walk if dx or dy is not 0
@@ -113,13 +129,19 @@ class Player(pygame.sprite.Sprite):
         # Animate!
         self.animate(dt)
         
-        self.rect.clamp_ip(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.rect.clamp_ip(self.bounds)
 
         # Energy regeneration
         if self.energy < self.max_energy:
             self.energy += 0.03 * dt
 
 
+    def draw_rect(self, alpha=1):
+        """Rect to draw at, a fraction alpha of the way from the previous simulation step to the current one"""
+        x0, y0 = self.previous_center
+        x1, y1 = self.rect.center
+        return self.rect.copy().move(round((x0 - x1) * (1 - alpha)), round((y0 - y1) * (1 - alpha)))
+
     # Helper methods for your UI and mechanics
     def use_energy(self, amount):
         if self.energy >= amount:
@@ -0,0 +1,147 @@
+import numpy as np
+from tile_grid import summed_area, area_sum
+
+# Owner ids stored per cell (0 means the plot is unclaimed)
+NO_OWNER = 0
+PLAYER = 1  # The local player
+
+# Bit flags stored per cell
+LOCKED = 1
+
+class PlotGrid:
+    """Plot ownership storage: a uint16 owner id and uint8 bit flags per cell"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.owners = np.zeros((height, width), dtype=np.uint16)
+        self.flags = np.zeros((height, width), dtype=np.uint8)
+        self.version = 0  # Bumped on every change
+
+        # Summed-area table of claimed cells, rebuilt when the version changes
+        self._claimed_table = None
+        self._claimed_version = -1
+
+    def in_bounds(self, x, y):
+        """Check if a grid position is inside the grid"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def clip(self, x0, y0, x1, y1):
+        """Clip the area [x0, x1) x [y0, y1) to the grid"""
+        return max(x0, 0), max(y0, 0), min(x1, self.width), min(y1, self.height)
+
+    def owner(self, x, y):
+        """Owner id of a cell (NO_OWNER if unclaimed or out of bounds)"""
+        if not self.in_bounds(x, y):
+            return NO_OWNER
+        return int(self.owners[y, x])
+
+    def is_locked(self, x, y):
+        """Check if a cell is locked"""
+        return self.in_bounds(x, y) and bool(self.flags[y, x] & LOCKED)
+
+    def claim(self, x0, y0, x1, y1, owner, where=None):
+        """Give the unclaimed cells of an area (optionally only where a mask is set) to an owner"""
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        owners = self.owners[y0:y1, x0:x1]
+        mask = owners == NO_OWNER
+        if where is not None:
+            mask &= where
+        owners[mask] = owner
+        return self.changed(mask, x0, y0)
+
+    def release(self, x0, y0, x1, y1, owner=None, where=None):
+        """Unclaim the unlocked cells of an area, optionally only those of one owner or where a mask is set"""
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        owners = self.owners[y0:y1, x0:x1]
+        mask = (owners != NO_OWNER) if owner is None else (owners == owner)
+        mask &= (self.flags[y0:y1, x0:x1] & LOCKED) == 0
+        if where is not None:
+            mask &= where
+        owners[mask] = NO_OWNER
+        return self.changed(mask, x0, y0)
+
+    def set_locked(self, x0, y0, x1, y1, locked, owner=None):
+        """Lock or unlock the claimed cells of an area, optionally only those of one owner"""
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        owners = self.owners[y0:y1, x0:x1]
+        flags = self.flags[y0:y1, x0:x1]
+        mask = (owners != NO_OWNER) if owner is None else (owners == owner)
+        if locked:
+            mask &= (flags & LOCKED) == 0
+            flags[mask] |= LOCKED
+        else:
+            mask &= (flags & LOCKED) != 0
+            flags[mask] &= ~LOCKED & 0xFF
+        return self.changed(mask, x0, y0)
+
+    def changed(self, mask, x0, y0):
+        """Bump the version and list the grid positions of the cells a mask selects"""
+        ys, xs = np.nonzero(mask)
+        if len(xs):
+            self.version += 1
+        return list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def count_claimed(self, x0, y0, x1, y1):
+        """Number of claimed cells in an area, in O(1) from a summed-area table"""
+        x0, y0, x1, y1 = self.clip(x0, y0, x1, y1)
+        if x0 >= x1 or y0 >= y1:
+            return 0
+        if self._claimed_version != self.version:
+            self._claimed_table = summed_area(self.owners != NO_OWNER)
+            self._claimed_version = self.version
+        return area_sum(self._claimed_table, x0, y0, x1, y1)
+
+    def cells(self, owner=None, flags=0, area=None):
+        """List of (x, y) grid positions that are claimed (by an owner) and have all given flags"""
+        x0, y0, x1, y1 = self.clip(*area) if area else (0, 0, self.width, self.height)
+        owners = self.owners[y0:y1, x0:x1]
+        mask = (owners != NO_OWNER) if owner is None else (owners == owner)
+        if flags:
+            mask &= (self.flags[y0:y1, x0:x1] & flags) == flags
+        ys, xs = np.nonzero(mask)
+        return list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def resize(self, width, height):
+        """Match the size of the map, keeping the plots that still fit"""
+        if (width, height) == (self.width, self.height):
+            return
+        owners = np.zeros((height, width), dtype=np.uint16)
+        flags = np.zeros((height, width), dtype=np.uint8)
+        keep_w, keep_h = min(width, self.width), min(height, self.height)
+        owners[:keep_h, :keep_w] = self.owners[:keep_h, :keep_w]
+        flags[:keep_h, :keep_w] = self.flags[:keep_h, :keep_w]
+        self.width, self.height = width, height
+        self.owners, self.flags = owners, flags
+        self.version += 1
+
+    def clear(self):
+        """Unclaim every cell"""
+        self.owners[:] = NO_OWNER
+        self.flags[:] = 0
+        self.version += 1
+
+    def to_runs(self):
+        """Row runs of equal owner and flags, as [y, x0, x1, owner, flags] lists for saving"""
+        runs = []
+        for y in np.nonzero((self.owners != NO_OWNER).any(axis=1))[0].tolist():
+            owners = self.owners[y].tolist()
+            flags = self.flags[y].tolist()
+            x = 0
+            while x < self.width:
+                owner, flag = owners[x], flags[x]
+                end = x + 1
+                while end < self.width and owners[end] == owner and flags[end] == flag:
+                    end += 1
+                if owner != NO_OWNER:
+                    runs.append([y, x, end, owner, flag])
+                x = end
+        return runs
+
+    def load_runs(self, runs):
+        """Restore plots saved by to_runs"""
+        self.clear()
+        for y, x0, x1, owner, flag in runs:
+            if 0 <= y < self.height:
+                self.owners[y, max(x0, 0):x1] = owner
+                self.flags[y, max(x0, 0):x1] = flag
@@ -1,25 +1,249 @@
 # plot_system.py
 import pygame
 from settings import *
+from fonts import get_font
+from plot_grid import PlotGrid, PLAYER, LOCKED
+from tile_grid import area_sum
+
+NEIGHBORS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Outline color of each owner's plots
+OWNER_COLORS = {PLAYER: (255, 215, 0)}  # Gold
+OTHER_OWNER_COLOR = (170, 170, 255)
+
+class PlotRegions:
+    """Connected regions of claimed plots with the same owner, kept up to date with union-find"""
+    
+    def __init__(self):
+        self.parent = {}  # Cell -> parent cell (roots point to themselves)
+        self.owners = {}  # Cell -> owner id
+        self.members = {}  # Root -> set of cells in its region
+        self.outlines = {}  # Root -> (bounds, merged outline segments), built on demand
+        
+    def find(self, cell):
+        """Root of the region containing a cell"""
+        parent = self.parent
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]  # Path halving
+            cell = parent[cell]
+        return cell
+        
+    def union(self, a, b):
+        """Merge the regions of two cells"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        # Attach the smaller region to the larger one
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.members[root_a] |= self.members.pop(root_b)
+        self.outlines.pop(root_a, None)
+        self.outlines.pop(root_b, None)
+        return root_a
+        
+    def add(self, cell, owner=PLAYER):
+        """Add a claimed cell, joining any neighbouring regions of the same owner"""
+        if cell in self.parent:
+            return
+        self.parent[cell] = cell
+        self.owners[cell] = owner
+        self.members[cell] = {cell}
+        x, y = cell
+        for dx, dy in NEIGHBORS:
+            neighbor = (x + dx, y + dy)
+            if self.owners.get(neighbor) == owner:
+                self.union(cell, neighbor)
+        self.outlines.pop(self.find(cell), None)
+                
+    def remove(self, cell):
+        """Remove a cell - its region is only rebuilt if it may have split"""
+        self.remove_many([cell])
+        
+    def remove_many(self, cells):
+        """Remove a batch of cells, rebuilding each region they touch once"""
+        removed = {}  # Root -> removed cells of its region
+        for cell in cells:
+            if cell in self.parent:
+                removed.setdefault(self.find(cell), set()).add(cell)
+        for root, gone in removed.items():
+            members = self.members.pop(root)
+            owner = self.owners[root]
+            self.outlines.pop(root, None)
+            for cell in gone:
+                del self.parent[cell]
+                del self.owners[cell]
+            members -= gone
+            if len(gone) == 1 and self.stays_connected(next(iter(gone)), members):
+                # Still one piece - just point every cell at a surviving root
+                new_root = root if root in members else next(iter(members))
+                for member in members:
+                    self.parent[member] = new_root
+                self.members[new_root] = members
+            else:
+                self.split(members, owner)
+                
+    def stays_connected(self, cell, members):
+        """Check if a region is still one piece after a cell was taken out of it"""
+        x, y = cell
+        neighbors = [(x + dx, y + dy) for dx, dy in NEIGHBORS if (x + dx, y + dy) in members]
+        if len(neighbors) <= 1:
+            return bool(members)
+        # Search from one neighbour until all the others are reached
+        targets = set(neighbors[1:])
+        seen = {neighbors[0]}
+        stack = [neighbors[0]]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in NEIGHBORS:
+                neighbor = (x + dx, y + dy)
+                if neighbor in members and neighbor not in seen:
+                    targets.discard(neighbor)
+                    if not targets:
+                        return True
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return False
+        
+    def split(self, cells, owner):
+        """Turn a set of cells of one owner into regions with a single flood fill"""
+        unvisited = set(cells)
+        while unvisited:
+            root = unvisited.pop()
+            region = {root}
+            stack = [root]
+            while stack:
+                x, y = stack.pop()
+                self.parent[(x, y)] = root
+                self.owners[(x, y)] = owner
+                for dx, dy in NEIGHBORS:
+                    neighbor = (x + dx, y + dy)
+                    if neighbor in unvisited:
+                        unvisited.discard(neighbor)
+                        region.add(neighbor)
+                        stack.append(neighbor)
+            self.members[root] = region
+            
+
+    def rebuild(self, cells):
+        """Replace all regions with the regions of (cell, owner) pairs"""
+        self.parent.clear()
+        self.owners.clear()
+        self.members.clear()
+        self.outlines.clear()
+        by_owner = {}
+        for cell, owner in cells:
+            by_owner.setdefault(owner, set()).add(cell)
+        for owner, owned in by_owner.items():
+            self.split(owned, owner)
+            
+    def regions(self):
+        """All regions as sets of cells"""
+        return list(self.members.values())
+        
+    def outline(self, root):
+        """Pixel bounds and merged edge segments of a region (cached until it changes)"""
+        outline = self.outlines.get(root)
+        if outline is None:
+            outline = self.build_outline(self.members[root])
+            self.outlines[root] = outline
+        return outline
+        
+    @staticmethod
+    def build_outline(region):
+        """Merge the exposed tile edges of a region into long horizontal and vertical segments"""
+        # Exposed edges grouped by the line they lie on: (axis, line) -> starts of unit edges
+        edges = {}
+        for x, y in region:
+            if (x, y - 1) not in region:
+                edges.setdefault(("h", y), []).append(x)
+            if (x, y + 1) not in region:
+                edges.setdefault(("h", y + 1), []).append(x)
+            if (x - 1, y) not in region:
+                edges.setdefault(("v", x), []).append(y)
+            if (x + 1, y) not in region:
+                edges.setdefault(("v", x + 1), []).append(y)
+                
+        segments = []
+        for (axis, line), starts in edges.items():
+            starts.sort()
+            run_start = prev = starts[0]
+            for start in starts[1:] + [None]:
+                if start is not None and start == prev + 1:
+                    prev = start
+                    continue
+                # Close the run [run_start, prev + 1)
+                a, b = run_start * TILE_SIZE, (prev + 1) * TILE_SIZE
+                pos = line * TILE_SIZE
+                segments.append(((a, pos), (b, pos)) if axis == "h" else ((pos, a), (pos, b)))
+                if start is not None:
+                    run_start = prev = start
+                    
+        xs = [x for x, _ in region]
+        ys = [y for _, y in region]
+        bounds = pygame.Rect(min(xs) * TILE_SIZE, min(ys) * TILE_SIZE,
+                             (max(xs) - min(xs) + 1) * TILE_SIZE, (max(ys) - min(ys) + 1) * TILE_SIZE)
+        return bounds, segments
 
 class PlotSystem:
     """Manages farmable plot claiming, selling, and locking"""
+    _lock_image = None  # Shared lock icon for locked plots
     
-    def __init__(self):
-        self.claimed_plots = set()  # Set of (grid_x, grid_y) tuples
-        self.locked_plots = set()  # Set of locked plots that can't be sold
+    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT):
+        self.grid = PlotGrid(width, height)  # Owner and lock bit of every cell
+        self.regions = PlotRegions()  # Connected regions of claimed plots
+        self.version = 0  # Bumped whenever plots are claimed, sold, locked or loaded
         self.claim_cost = 50  # Cost to claim a plot
         self.sell_value = int(self.claim_cost * 0.8)  # 80% refund
-        self.font = pygame.font.Font(None, 18)
-        self.small_font = pygame.font.Font(None, 14)
+        self.font = get_font(18)
+        self.small_font = get_font(14)
+        
+        # Summed-area table of grass tiles, rebuilt when the world changes
+        self._grass_table = None
+        self._grass_key = None
+        
+    @property
+    def claimed_plots(self):
+        """Set of claimed (grid_x, grid_y) positions"""
+        return set(self.grid.cells())
+    
+    @property
+    def locked_plots(self):
+        """Set of locked (grid_x, grid_y) positions"""
+        return set(self.grid.cells(flags=LOCKED))
+        
+    def resize(self, width, height):
+        """Match the size of the map, dropping plots that no longer fit"""
+        if (width, height) == (self.grid.width, self.grid.height):
+            return
+        self.grid.resize(width, height)
+        self.regions.rebuild((cell, self.grid.owner(*cell)) for cell in self.grid.cells())
+        self.version += 1
         
     def is_claimed(self, grid_pos):
         """Check if a plot is claimed"""
-        return grid_pos in self.claimed_plots
+        return self.grid.owner(*grid_pos) != 0
     
     def is_locked(self, grid_pos):
         """Check if a plot is locked"""
-        return grid_pos in self.locked_plots
+        return self.grid.is_locked(*grid_pos)
+    
+    def grass_table(self, world):
+        """Summed-area table of the world's grass tiles"""
+        key = (id(world.grid), world.version)
+        if key != self._grass_key:
+            self._grass_table = world.grid.summed_area("G")
+            self._grass_key = key
+        return self._grass_table
+    
+    def is_rect_claimable(self, rect, world):
+        """Check if every tile of a grid rect (x0, y0, x1, y1) is unclaimed grass - O(1) per query"""
+        x0, y0, x1, y1 = rect
+        if x0 < 0 or y0 < 0 or x1 > world.width or y1 > world.height or x0 >= x1 or y0 >= y1:
+            return False
+        area = (x1 - x0) * (y1 - y0)
+        grass = area_sum(self.grass_table(world), x0, y0, x1, y1)
+        return grass == area and self.grid.count_claimed(x0, y0, x1, y1) == 0
     
     def can_claim(self, grid_pos, world, player):
         """Check if a position can be claimed - ONLY with hoe equipped"""
@@ -27,29 +251,27 @@ class PlotSystem:
         if player.current_tool != "hoe":
             return False
             
-        tile = world.tile_map.get(grid_pos)
+        tile = world.get_tile(grid_pos)
         if not tile:
             return False
         
         # Only grass tiles can be claimed
-        return tile.kind == "G" and grid_pos not in self.claimed_plots
+        return tile.kind == "G" and not self.is_claimed(grid_pos)
     
     def can_sell(self, grid_pos, world):
         """Check if a plot can be sold"""
-        if grid_pos not in self.claimed_plots:
+        if not self.is_claimed(grid_pos):
             return False, "Plot not claimed!"
         
-        if grid_pos in self.locked_plots:
+        if self.is_locked(grid_pos):
             return False, "Plot is locked! Unlock first (L key)"
         
         # Check if there's a crop on this plot
-        tile_pos = (grid_pos[0] * TILE_SIZE, grid_pos[1] * TILE_SIZE)
-        for crop in world.crops:
-            if crop.rect.topleft == tile_pos:
-                return False, "Remove crops first!"
+        if world.crop_at(grid_pos):
+            return False, "Remove crops first!"
         
         # Check if tile is tilled
-        tile = world.tile_map.get(grid_pos)
+        tile = world.get_tile(grid_pos)
         if tile and tile.kind == "S":
             return False, "Tile is tilled! Can't sell."
         
@@ -69,9 +291,35 @@ class PlotSystem:
         
         # Deduct money and claim plot
         player.money -= self.claim_cost
-        self.claimed_plots.add(grid_pos)
+        self.claim_cells(grid_pos[0], grid_pos[1], grid_pos[0] + 1, grid_pos[1] + 1, PLAYER)
         return True, f"Plot claimed! (-${self.claim_cost})"
     
+    def claim_rect(self, rect, player, world, owner=PLAYER):
+        """Claim a whole grid rect (x0, y0, x1, y1) of unclaimed grass in one go"""
+        if player.current_tool != "hoe":
+            return False, "Must have HOE equipped to claim plots! (Press T)"
+        
+        if not self.is_rect_claimable(rect, world):
+            return False, "Cannot claim this area!"
+        
+        x0, y0, x1, y1 = rect
+        cost = self.claim_cost * (x1 - x0) * (y1 - y0)
+        if player.money < cost:
+            return False, f"Need ${cost} to claim area!"
+        
+        player.money -= cost
+        self.claim_cells(x0, y0, x1, y1, owner)
+        return True, f"Area claimed! (-${cost})"
+    
+    def claim_cells(self, x0, y0, x1, y1, owner):
+        """Give the unclaimed cells of a grid rect to an owner"""
+        cells = self.grid.claim(x0, y0, x1, y1, owner)
+        for cell in cells:
+            self.regions.add(cell, owner)
+        if cells:
+            self.version += 1
+        return cells
+    
     def sell_plot(self, grid_pos, player, world):
         """Sell a claimed plot for 80% of claim cost"""
         can_sell, message = self.can_sell(grid_pos, world)
@@ -80,122 +328,114 @@ class PlotSystem:
             return False, message
         
         # Remove from claimed plots and give money back
-        self.claimed_plots.remove(grid_pos)
-        
-        # Also remove from locked plots if it was locked
-        if grid_pos in self.locked_plots:
-            self.locked_plots.remove(grid_pos)
+        self.release_cells(grid_pos[0], grid_pos[1], grid_pos[0] + 1, grid_pos[1] + 1)
         
         player.money += self.sell_value
         return True, f"Plot sold! (+${self.sell_value})"
     
+    def sell_rect(self, rect, player, world, owner=PLAYER):
+        """Sell every sellable plot of an owner in a grid rect (unlocked, untilled, no crop)"""
+        x0, y0, x1, y1 = self.grid.clip(*rect)
+        if x0 >= x1 or y0 >= y1:
+            return False, "Nothing to sell here!"
+        
+        # Tilled tiles and tiles with crops can't be sold
+        world.grid.ensure_loaded(x0, y0, x1, y1)
+        sellable = world.grid.kinds[y0:y1, x0:x1] != world.grid.code("S")
+        area = pygame.Rect(x0 * TILE_SIZE, y0 * TILE_SIZE, (x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE)
+        for crop in world.visible_crops(area):
+            crop_x, crop_y = crop.rect.x // TILE_SIZE, crop.rect.y // TILE_SIZE
+            if x0 <= crop_x < x1 and y0 <= crop_y < y1:
+                sellable[crop_y - y0, crop_x - x0] = False
+        
+        sold = len(self.release_cells(x0, y0, x1, y1, owner, sellable))
+        if not sold:
+            return False, "Nothing to sell here!"
+        
+        refund = self.sell_value * sold
+        player.money += refund
+        return True, f"{sold} plots sold! (+${refund})"
+    
+    def release_cells(self, x0, y0, x1, y1, owner=None, where=None):
+        """Unclaim the unlocked cells of a grid rect"""
+        cells = self.grid.release(x0, y0, x1, y1, owner, where)
+        self.regions.remove_many(cells)
+        if cells:
+            self.version += 1
+        return cells
+    
     def toggle_lock(self, grid_pos):
         """Toggle lock status of a plot"""
-        if grid_pos not in self.claimed_plots:
+        if not self.is_claimed(grid_pos):
             return False, "Plot not claimed!"
         
-        if grid_pos in self.locked_plots:
-            self.locked_plots.remove(grid_pos)
+        x, y = grid_pos
+        if self.is_locked(grid_pos):
+            self.lock_rect((x, y, x + 1, y + 1), False)
             return True, "Plot unlocked!"
         else:
-            self.locked_plots.add(grid_pos)
+            self.lock_rect((x, y, x + 1, y + 1), True)
             return True, "Plot locked!"
     
+    def lock_rect(self, rect, locked=True, owner=None):
+        """Lock or unlock every claimed plot (of an owner) in a grid rect"""
+        changed = self.grid.set_locked(*rect, locked, owner)
+        if changed:
+            self.version += 1
+        return len(changed)
+    
     def get_connected_plots(self):
         """Group claimed plots into connected regions for outline drawing"""
-        if not self.claimed_plots:
-            return []
-        
-        visited = set()
-        regions = []
-        
-        for plot in self.claimed_plots:
-            if plot in visited:
-                continue
-            
-            # BFS to find connected region
-            region = set()
-            queue = [plot]
-            
-            while queue:
-                current = queue.pop(0)
-                if current in visited:
-                    continue
-                
-                visited.add(current)
-                region.add(current)
-                
-                # Check 4 neighbors
-                x, y = current
-                neighbors = [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
-                
-                for neighbor in neighbors:
-                    if neighbor in self.claimed_plots and neighbor not in visited:
-                        queue.append(neighbor)
-            
-            regions.append(region)
-        
-        return regions
+        return self.regions.regions()
+    
+    @classmethod
+    def get_lock_image(cls):
+        """Shared lock icon drawn on locked plots"""
+        if cls._lock_image is None:
+            lock_surface = pygame.Surface((12, 12), pygame.SRCALPHA)
+            # Lock body
+            pygame.draw.rect(lock_surface, (255, 215, 0), (2, 5, 8, 6))
+            # Lock shackle
+            pygame.draw.arc(lock_surface, (255, 215, 0), (3, 1, 6, 6), 0, 3.14159, 2)
+            cls._lock_image = lock_surface
+        return cls._lock_image
     
-    def draw_claimed_indicators(self, surface):
+    def draw_claimed_indicators(self, surface, camera):
         """Draw visual indicators for claimed plots with connected outlines"""
-        regions = self.get_connected_plots()
+        # Draw the cached outline of each region in view
+        for root in list(self.regions.members):
+            bounds, segments = self.regions.outline(root)
+            if not camera.is_visible(bounds, 2):
+                continue
+            outline_color = OWNER_COLORS.get(self.regions.owners[root], OTHER_OWNER_COLOR)
+            for start, end in segments:
+                pygame.draw.line(surface, outline_color,
+                                 camera.apply_point(start), camera.apply_point(end), 2)
         
-        for region in regions:
-            # Draw outline for each connected region
-            outline_color = (255, 215, 0)  # Gold
-            
-            for grid_x, grid_y in region:
-                x = grid_x * TILE_SIZE
-                y = grid_y * TILE_SIZE
-                
-                # Draw lock icon if plot is locked
-                if (grid_x, grid_y) in self.locked_plots:
-                    lock_surface = pygame.Surface((12, 12), pygame.SRCALPHA)
-                    # Lock body
-                    pygame.draw.rect(lock_surface, (255, 215, 0), (2, 5, 8, 6))
-                    # Lock shackle
-                    pygame.draw.arc(lock_surface, (255, 215, 0), (3, 1, 6, 6), 0, 3.14159, 2)
-                    # Draw lock in corner of tile
-                    surface.blit(lock_surface, (x + 2, y + 2))
-                
-                # Check each edge to see if it should be drawn
-                # Top edge
-                if (grid_x, grid_y - 1) not in region:
-                    pygame.draw.line(surface, outline_color, 
-                                   (x, y), (x + TILE_SIZE, y), 2)
-                
-                # Bottom edge
-                if (grid_x, grid_y + 1) not in region:
-                    pygame.draw.line(surface, outline_color, 
-                                   (x, y + TILE_SIZE), (x + TILE_SIZE, y + TILE_SIZE), 2)
-                
-                # Left edge
-                if (grid_x - 1, grid_y) not in region:
-                    pygame.draw.line(surface, outline_color, 
-                                   (x, y), (x, y + TILE_SIZE), 2)
-                
-                # Right edge
-                if (grid_x + 1, grid_y) not in region:
-                    pygame.draw.line(surface, outline_color, 
-                                   (x + TILE_SIZE, y), (x + TILE_SIZE, y + TILE_SIZE), 2)
+        # Draw lock icon in the corner of locked plots in view
+        view = camera.rect
+        area = (view.left // TILE_SIZE, view.top // TILE_SIZE,
+                (view.right - 1) // TILE_SIZE + 1, (view.bottom - 1) // TILE_SIZE + 1)
+        lock_image = self.get_lock_image()
+        for grid_x, grid_y in self.grid.cells(flags=LOCKED, area=area):
+            x, y = camera.apply_point((grid_x * TILE_SIZE, grid_y * TILE_SIZE))
+            surface.blit(lock_image, (x + 2, y + 2))
     
-    def draw_claimable_hint(self, surface, mouse_pos, world, player):
+    def draw_claimable_hint(self, surface, mouse_pos, world, player, camera):
         """Draw hint when hovering over claimable plot - ONLY when hoe is equipped"""
         grid_x = mouse_pos[0] // TILE_SIZE
         grid_y = mouse_pos[1] // TILE_SIZE
         grid_pos = (grid_x, grid_y)
         
-        x = grid_x * TILE_SIZE
-        y = grid_y * TILE_SIZE
+        x, y, size, _ = camera.apply(pygame.Rect(grid_x * TILE_SIZE, grid_y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
         
         # Check if plot is claimed and can be sold
-        if grid_pos in self.claimed_plots:
+        if self.is_claimed(grid_pos):
             can_sell, sell_message = self.can_sell(grid_pos, world)
-            is_locked = grid_pos in self.locked_plots
+            is_locked = self.is_locked(grid_pos)
             
             # Draw highlight
-            highlight = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            highlight = pygame.Surface((size, size))
             highlight.set_alpha(80)
             if is_locked:
                 highlight.fill((255, 165, 0))  # Orange for locked
@@ -214,7 +454,7 @@ class PlotSystem:
                 text = self.font.render(sell_message, True, RED)
             
             # Position above tile
-            text_x = x + TILE_SIZE // 2 - text.get_width() // 2
+            text_x = x + size // 2 - text.get_width() // 2
             text_y = y - 25
             
             # Background
@@ -228,7 +468,7 @@ class PlotSystem:
         # Check if plot can be claimed (only when hoe equipped)
         elif player.current_tool == "hoe" and self.can_claim(grid_pos, world, player):
             # Draw highlight
-            highlight = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            highlight = pygame.Surface((size, size))
             highlight.set_alpha(80)
             highlight.fill((255, 255, 100))
             surface.blit(highlight, (x, y))
@@ -239,7 +479,7 @@ class PlotSystem:
             text = self.font.render(f"Right-click: Claim (${self.claim_cost})", True, color)
             
             # Position above tile
-            text_x = x + TILE_SIZE // 2 - text.get_width() // 2
+            text_x = x + size // 2 - text.get_width() // 2
             text_y = y - 20
             
             # Background
@@ -253,13 +493,19 @@ class PlotSystem:
     def save_data(self):
         """Return data for saving"""
         return {
-            "claimed_plots": list(self.claimed_plots),
-            "locked_plots": list(self.locked_plots)
+            "plot_runs": self.grid.to_runs()  # [y, x0, x1, owner, flags] per run of equal plots
         }
     
     def load_data(self, data):
         """Load saved data"""
-        if "claimed_plots" in data:
-            self.claimed_plots = set(tuple(pos) for pos in data["claimed_plots"])
-        if "locked_plots" in data:
-            self.locked_plots = set(tuple(pos) for pos in data["locked_plots"])
\ No newline at end of file
+        self.version += 1
+        if "plot_runs" in data:
+            self.grid.load_runs(data["plot_runs"])
+        elif "claimed_plots" in data:
+            # Older saves list the claimed and locked plots of the player
+            self.grid.clear()
+            for x, y in data["claimed_plots"]:
+                self.grid.claim(x, y, x + 1, y + 1, PLAYER)
+            for x, y in data.get("locked_plots", []):
+                self.grid.set_locked(x, y, x + 1, y + 1, True)
+        self.regions.rebuild((cell, self.grid.owner(*cell)) for cell in self.grid.cells())
@@ -7,6 +7,29 @@ DEFAULT_SCREEN_HEIGHT = TILE_SIZE * MAP_HEIGHT
 MIN_SCREEN_WIDTH = 800
 MIN_SCREEN_HEIGHT = 600
 FPS = 60
+SIM_RATE = 30  # Simulation steps per second - rendering interpolates between them at up to FPS
+MAX_SIM_STEPS = 5  # Steps run per frame at most before the simulation stops catching up
+
+# World streaming
+CHUNK_SIZE = 32  # Tiles per chunk side
+CHUNK_LOAD_RADIUS = 1  # Chunks kept loaded around the player
+CHUNK_EVICT_RADIUS = 2  # Chunks further away than this are evicted
+
+# Entities
+WORLD_SEED = 20240601  # Seeds the per-entity random streams, so runs can be reproduced
+SPATIAL_CELL_SIZE = TILE_SIZE * 4  # Side of a spatial hash cell (world pixels) for proximity queries
+LOD_NEAR_MARGIN = TILE_SIZE * 8  # Off-screen animals within this distance of the view keep moving
+LOD_NEAR_INTERVAL = 4  # Frames between updates of near off-screen animals
+
+# Rendering
+NATIVE_RENDERING = True  # Draw at window resolution instead of scaling a fixed-size frame
+SPRITE_CACHE_SIZE = 256  # Scaled sprite variants kept for native rendering
+LIGHTING = True  # Light the night with point lights instead of a flat overlay
+LIGHT_MAP_SCALE = 4  # View pixels per light map pixel
+LIGHT_STAMP_CACHE_SIZE = 64  # Light gradients kept for reuse (new ones are made when the render scale changes)
+TEXT_CACHE_SIZE = 512  # Rendered text surfaces kept for reuse
+DIRTY_RECTS = True  # Only repaint and push the parts of the window that changed
+DIRTY_AREA_THRESHOLD = 0.4  # Above this fraction of the window, redraw and flip everything
 
 # Dynamic screen size (will be updated by game)
 SCREEN_WIDTH = DEFAULT_SCREEN_WIDTH
@@ -33,6 +56,8 @@ CROP_SELL_MULTIPLIER = 2
 TIME_SPEED = 0.001  # How fast time passes
 NIGHT_START = 18
 NIGHT_END = 6
+OVERLAY_ALPHA_STEP = 6  # Day/night overlay alpha is rounded to this step
+OVERLAY_CACHE_SIZE = 4  # Day/night overlay surfaces kept for reuse
 
 def update_screen_size(width, height):
     """Update global screen size variables"""
@@ -0,0 +1,75 @@
+import math
+from settings import *
+
+class SpatialHash:
+    """Uniform grid of buckets for finding the entities near a point without scanning them all"""
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, locate=None):
+        self.cell_size = cell_size
+        self.buckets = {}  # Cell -> set of entities
+        self.entries = {}  # Entity -> (cell, kind)
+        # Exact world position of an entity, checked for the candidates of a query
+        self.locate = locate or (lambda entity: entity.rect.center)
+
+    def cell_of(self, pos):
+        """Grid cell containing a world position"""
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    def insert(self, entity, pos, kind=None):
+        """Add an entity at a world position"""
+        cell = self.cell_of(pos)
+        self.entries[entity] = (cell, kind)
+        self.buckets.setdefault(cell, set()).add(entity)
+
+    def move(self, entity, pos):
+        """Update the cell of an entity that moved"""
+        old_cell, kind = self.entries[entity]
+        cell = self.cell_of(pos)
+        if cell == old_cell:
+            return
+        self.discard_from(old_cell, entity)
+        self.entries[entity] = (cell, kind)
+        self.buckets.setdefault(cell, set()).add(entity)
+
+    def remove(self, entity):
+        """Forget an entity"""
+        entry = self.entries.pop(entity, None)
+        if entry is not None:
+            self.discard_from(entry[0], entity)
+
+    def discard_from(self, cell, entity):
+        """Take an entity out of a bucket, dropping the bucket once it is empty"""
+        bucket = self.buckets[cell]
+        bucket.discard(entity)
+        if not bucket:
+            del self.buckets[cell]
+
+    def candidates(self, point, radius, kind=None):
+        """Entities in the cells overlapping a circle (some may lie outside it)"""
+        min_x, min_y = self.cell_of((point[0] - radius, point[1] - radius))
+        max_x, max_y = self.cell_of((point[0] + radius, point[1] + radius))
+        entries = self.entries
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                for entity in self.buckets.get((cell_x, cell_y), ()):
+                    if kind is None or entries[entity][1] == kind:
+                        yield entity
+
+    def query_radius(self, point, radius, kind=None):
+        """List of (distance, entity) within radius of a point, closest first"""
+        found = []
+        for entity in self.candidates(point, radius, kind):
+            x, y = self.locate(entity)
+            distance = math.hypot(x - point[0], y - point[1])
+            if distance <= radius:
+                found.append((distance, entity))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, point, radius, kind=None):
+        """Closest entity (of a kind) within radius of a point, or None"""
+        found = self.query_radius(point, radius, kind)
+        return found[0][1] if found else None
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,42 @@
+import pygame
+from collections import OrderedDict
+
+class SpriteCache:
+    """Bounded cache of sprite images pre-scaled to the current render scale"""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.scale = 1.0
+        self._images = OrderedDict()  # Source surface -> scaled surface (least recently used first)
+
+    def set_scale(self, scale):
+        """Change the render scale, dropping variants of the old one"""
+        if scale != self.scale:
+            self.scale = scale
+            self._images.clear()
+
+    def get(self, image):
+        """Get an image scaled to the current render scale"""
+        if self.scale == 1:
+            return image
+
+        scaled = self._images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (round(width * self.scale), round(height * self.scale))
+            scaled = pygame.transform.scale(image, size)
+            self._images[image] = scaled
+            if len(self._images) > self.capacity:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(image)
+        return scaled
+
+    def prescale(self, images):
+        """Scale a batch of images ahead of time (e.g. right after a resize)"""
+        for image in images:
+            self.get(image)
+
+    def clear(self):
+        """Forget all scaled images"""
+        self._images.clear()
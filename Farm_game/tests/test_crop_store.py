@@ -0,0 +1,76 @@
+import numpy as np
+from crop_store import CropStore
+
+class ReferenceCrop:
+    """Growth rule of the original per-crop Crop.update, evaluated every frame"""
+
+    def __init__(self, time_planted, growth_time, max_stage=3):
+        self.time_planted = time_planted
+        self.growth_time = growth_time
+        self.max_stage = max_stage
+        self.stage = 0
+        self.needs_water = False
+        self.watered = True
+
+    def water(self):
+        if not self.watered:
+            self.watered = True
+            self.needs_water = False
+
+    def update(self, current_time):
+        growth_multiplier = 0.5 if not self.watered and self.stage >= 1 else 1.0
+        adjusted_time = (current_time - self.time_planted) * growth_multiplier
+        new_stage = min(int(adjusted_time / (self.growth_time / self.max_stage)), self.max_stage)
+        if new_stage > self.stage:
+            self.stage = new_stage
+            if self.stage < self.max_stage:
+                self.needs_water = True
+                self.watered = False
+
+class StubCrop:
+    def __init__(self):
+        self.changes = 0
+
+    def stage_changed(self):
+        self.changes += 1
+
+def test_heap_schedule_matches_per_frame_rule():
+    rng = np.random.default_rng(1)
+    store = CropStore(capacity=2)  # Forces the arrays to grow
+    references, slots = [], []
+    for _ in range(40):
+        planted = float(rng.uniform(0, 10))
+        growth_time = float(rng.choice([15, 20, 25, 30]))
+        references.append(ReferenceCrop(planted, growth_time))
+        slots.append(store.add(StubCrop(), planted, growth_time, 3))
+
+    for frame in range(1, 6000):
+        now = 10 + frame * 0.0173  # Frame times that don't line up with stage boundaries
+        for crop, slot in zip(references, slots):
+            if crop.needs_water and rng.random() < 0.002:
+                crop.water()
+                store.water(slot)
+            crop.update(now)
+        store.update(now)
+        for crop, slot in zip(references, slots):
+            assert store.stage[slot] == crop.stage
+            assert store.watered[slot] == crop.watered
+            assert store.needs_water[slot] == crop.needs_water
+
+def test_idle_update_touches_nothing():
+    store = CropStore()
+    crop = StubCrop()
+    slot = store.add(crop, 0.0, 30, 3)
+    assert store.update(5.0).size == 0
+    assert store.update(10.0).tolist() == [slot]
+    assert crop.changes == 1 and store.stage[slot] == 1
+
+def test_removed_slot_is_reused_without_stale_transitions():
+    store = CropStore()
+    old = store.add(StubCrop(), 0.0, 3, 3)
+    store.remove(old)
+    crop = StubCrop()
+    new = store.add(crop, 100.0, 30, 3)
+    assert new == old
+    store.update(5.0)  # The removed crop's stage change must not fire
+    assert crop.changes == 0 and store.stage[new] == 0
@@ -0,0 +1,27 @@
+import numpy as np
+from entity_random import stream_keys, stream_bits, stream_floats
+
+def test_streams_are_reproducible_and_seeded():
+    ids = np.arange(100, dtype=np.uint64)
+    keys = stream_keys(1234, ids)
+    np.testing.assert_array_equal(keys, stream_keys(1234, ids))
+    assert (keys != stream_keys(1235, ids)).all()
+    assert len(set(keys.tolist())) == len(ids)
+
+def test_values_depend_only_on_key_and_counter():
+    keys = stream_keys(7, np.arange(50, dtype=np.uint64))
+    counters = np.arange(50, dtype=np.uint64)[::-1]
+    values = stream_bits(keys, counters)
+    # Drawing for a subset, in another order, gives the same values
+    order = np.random.default_rng(0).permutation(50)[:20]
+    np.testing.assert_array_equal(stream_bits(keys[order], counters[order]), values[order])
+
+def test_floats_are_uniform():
+    keys = stream_keys(99, np.arange(200, dtype=np.uint64))[:, None]
+    counters = np.arange(500, dtype=np.uint64)[None, :]
+    values = stream_floats(keys, counters)
+    assert values.min() >= 0 and values.max() < 1
+    histogram = np.histogram(values, bins=10, range=(0, 1))[0]
+    assert np.abs(histogram / values.size - 0.1).max() < 0.01
+    # Neighbouring draws of a stream are not correlated
+    assert abs(np.corrcoef(values[:, :-1].ravel(), values[:, 1:].ravel())[0, 1]) < 0.01
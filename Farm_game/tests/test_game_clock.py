@@ -0,0 +1,29 @@
+from game_clock import GameClock
+
+def test_timer_is_exact_for_any_step():
+    for step in (1, 2.5, 7, 1000):
+        clock = GameClock()
+        timer = clock.timer(90)
+        while not timer.done:
+            assert timer.remaining > 0
+            clock.advance(step)
+        assert clock.now >= 90 > clock.now - step  # Runs out on the first step past the deadline
+        assert timer.remaining == 0
+
+def test_start_and_stop():
+    clock = GameClock()
+    timer = clock.timer()
+    assert timer.done
+    clock.advance(10)
+    timer.start(5)
+    assert timer.remaining == 5 and not timer.done
+    clock.advance(3)
+    assert timer.remaining == 2
+    timer.stop()
+    assert timer.done and timer.remaining == 0
+
+def test_timers_share_their_clock():
+    clock = GameClock()
+    short, long = clock.timer(10), clock.timer(20)
+    clock.advance(15)
+    assert short.done and not long.done
@@ -0,0 +1,46 @@
+import numpy as np
+from herd_store import HerdStore, NEEDS_FEED, HAS_PRODUCT
+
+DATA = {"speed": 0.5, "wander_radius": 100, "product_time": 437, "feed_cooldown": 173}
+BOUNDS = (400, 300)
+
+def run_herd(dt, ticks=3000, feed_every=600):
+    herd = HerdStore(bounds=BOUNDS)
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        herd.add(None, tuple(rng.uniform(20, 280, 2)), (32, 32), DATA)
+    for _ in range(int(ticks / dt)):
+        herd.update(dt)
+        if herd.clock.now % feed_every == 0:
+            for slot in range(herd.size):
+                if herd.state[slot] == HAS_PRODUCT:
+                    herd.state[slot] = NEEDS_FEED  # Collect the product
+                herd.feed(slot)
+    return herd
+
+def test_step_size_does_not_change_the_herd():
+    fine = run_herd(1)
+    for dt in (2, 10, 60):
+        coarse = run_herd(dt)
+        np.testing.assert_allclose(coarse.position, fine.position, atol=1e-6)
+        np.testing.assert_array_equal(coarse.state, fine.state)
+        np.testing.assert_array_equal(coarse.draws, fine.draws)
+
+def test_animals_stay_inside_the_area():
+    herd = run_herd(30)
+    half = herd.half_size[:herd.size]
+    position = herd.position[:herd.size]
+    assert (position >= half).all() and (position <= np.array(BOUNDS) - half).all()
+
+def test_behaviour_changes_default_to_the_clock():
+    herd = HerdStore(bounds=BOUNDS)
+    slot = herd.add(None, (100, 100), (32, 32), DATA)
+    herd.clock.advance(50)
+    herd.change_movement_state(np.array([slot]))
+    assert herd.state_until[slot] >= 50 + 120
+
+def test_standalone_animals_get_their_own_streams():
+    from animal import Animal
+    animals = [Animal((100, 100), "chicken") for _ in range(3)]
+    keys = {int(animal.store.stream_key[animal.slot]) for animal in animals}
+    assert len(keys) == len(animals)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from map_format import MapFile, convert_text_map, is_map_file, write_map
+from tile_grid import TileGrid, TILLED
+
+ROWS = ["TGTGTGTGTG", "GGSSSGGWPF", "RGSSSGGWPF", "GGGGGGGWWF", "FFFFFFFFFF", "GPG"]
+
+def test_text_map_round_trip(tmp_path):
+    src = tmp_path / "map.txt"
+    dst = tmp_path / "map.bin"
+    src.write_text("\n".join(ROWS) + "\n")
+    assert convert_text_map(src, dst, chunk_size=4) == (10, 6)
+    assert is_map_file(dst) and not is_map_file(src)
+
+    expected = TileGrid.from_rows(ROWS)
+    map_file = MapFile(dst)
+    assert (map_file.width, map_file.height, map_file.chunk_size) == (10, 6, 4)
+    assert (map_file.chunks_x, map_file.chunks_y) == (3, 2)
+
+    grid = TileGrid.from_map_file(map_file)
+    assert grid.get_kind(2, 1) == "S"  # Pages in one chunk
+    assert grid.loaded_chunks.sum() == 1
+    assert grid.has_flag(2, 1, TILLED)
+    grid.ensure_all_loaded()
+    np.testing.assert_array_equal(grid.kinds, expected.kinds)
+    np.testing.assert_array_equal(grid.flags, expected.flags)
+
+def test_chunks_are_padded_past_the_edge(tmp_path):
+    kinds = np.arange(1, 16, dtype=np.uint8).reshape(3, 5)
+    write_map(tmp_path / "map.bin", kinds, chunk_size=4)
+    map_file = MapFile(tmp_path / "map.bin")
+    corner = map_file.read_chunk(1, 0)
+    np.testing.assert_array_equal(corner[:3, :1], kinds[:, 4:])
+    assert not corner[3:].any() and not corner[:, 1:].any()
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "map.bin"
+    path.write_bytes(b"NOTAMAP!" + bytes(32))
+    with pytest.raises(ValueError):
+        MapFile(path)
@@ -0,0 +1,99 @@
+import numpy as np
+import pygame
+import pytest
+from plot_grid import PlotGrid, PLAYER, LOCKED, NO_OWNER
+from plot_system import PlotSystem
+from tile_grid import TileGrid
+from world import World
+
+def random_grid(seed, width=23, height=11):
+    rng = np.random.default_rng(seed)
+    grid = PlotGrid(width, height)
+    grid.owners[:] = rng.choice([NO_OWNER, PLAYER, 2, 7], size=(height, width), p=[0.4, 0.3, 0.2, 0.1])
+    grid.flags[:] = np.where(grid.owners != NO_OWNER, rng.integers(0, 2, size=(height, width)), 0)
+    grid.version += 1
+    return grid
+
+def test_runs_round_trip():
+    for seed in range(5):
+        grid = random_grid(seed)
+        restored = PlotGrid(grid.width, grid.height)
+        restored.claim(0, 0, 5, 5, PLAYER)  # Loading replaces whatever was there
+        restored.load_runs(grid.to_runs())
+        np.testing.assert_array_equal(restored.owners, grid.owners)
+        np.testing.assert_array_equal(restored.flags, grid.flags)
+
+def test_runs_merge_equal_neighbours():
+    grid = PlotGrid(10, 3)
+    grid.claim(2, 1, 8, 2, PLAYER)
+    grid.set_locked(5, 1, 6, 2, True)
+    assert grid.to_runs() == [[1, 2, 5, PLAYER, 0], [1, 5, 6, PLAYER, LOCKED], [1, 6, 8, PLAYER, 0]]
+
+def test_count_claimed_matches_brute_force():
+    grid = random_grid(9)
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        x0, x1 = sorted(rng.integers(-2, 26, 2))
+        y0, y1 = sorted(rng.integers(-2, 14, 2))
+        expected = int((grid.owners[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] != NO_OWNER).sum())
+        assert grid.count_claimed(x0, y0, x1, y1) == expected
+    grid.release(0, 0, grid.width, grid.height)  # Locked cells stay claimed
+    assert grid.count_claimed(0, 0, grid.width, grid.height) == int((grid.flags & LOCKED).astype(bool).sum())
+
+def test_resize_keeps_plots_that_fit():
+    grid = PlotGrid(6, 6)
+    grid.claim(0, 0, 6, 6, PLAYER)
+    grid.resize(4, 8)
+    assert grid.owners.shape == (8, 4)
+    assert grid.count_claimed(0, 0, 4, 8) == 24
+
+class Player:
+    current_tool = "hoe"
+    money = 10 ** 9
+
+@pytest.fixture
+def world():
+    pygame.init()
+    world = World()
+    world.grid = TileGrid.from_rows(["G" * 120] * 120)
+    return world
+
+def test_bulk_claim_and_sell(world):
+    plots = PlotSystem(world.width, world.height)
+    player = Player()
+    assert plots.claim_rect((0, 0, 100, 100), player, world)[0]
+    assert not plots.is_rect_claimable((90, 90, 110, 110), world)
+    assert plots.is_rect_claimable((100, 0, 120, 120), world)
+
+    plots.lock_rect((0, 0, 10, 10))
+    world.grid.set_kind(20, 20, "S")  # Tilled plots can't be sold
+    success, message = plots.sell_rect((0, 0, 30, 30), player, world)
+    assert success and message.startswith(f"{30 * 30 - 100 - 1} plots sold")
+
+    claimed = plots.claimed_plots
+    assert len(claimed) == 100 * 100 - (30 * 30 - 100 - 1)
+    regions = plots.get_connected_plots()
+    assert sorted(map(len, regions)) == [1, 100, len(claimed) - 101]
+    assert set().union(*regions) == claimed
+
+def test_save_and_load(world):
+    plots = PlotSystem(world.width, world.height)
+    plots.claim_cells(3, 3, 9, 5, PLAYER)
+    plots.lock_rect((4, 4, 6, 5))
+    loaded = PlotSystem(world.width, world.height)
+    loaded.load_data(plots.save_data())
+    assert loaded.claimed_plots == plots.claimed_plots
+    assert loaded.locked_plots == {(4, 4), (5, 4)}
+    assert len(loaded.get_connected_plots()) == 1
+
+    legacy = PlotSystem(world.width, world.height)
+    legacy.load_data({"claimed_plots": [[1, 1], [1, 2]], "locked_plots": [[1, 2]]})
+    assert legacy.claimed_plots == {(1, 1), (1, 2)} and legacy.locked_plots == {(1, 2)}
+
+def test_plot_system_follows_map_size(world):
+    plots = PlotSystem(world.width, world.height)
+    plots.claim_cells(0, 0, 120, 2, PLAYER)
+    plots.resize(60, 60)
+    assert plots.grid.owners.shape == (60, 60)
+    assert len(plots.claimed_plots) == 120
+    assert sum(map(len, plots.get_connected_plots())) == 120
@@ -0,0 +1,91 @@
+import random
+from plot_system import PlotRegions, NEIGHBORS
+from settings import TILE_SIZE
+
+def bfs_regions(owners):
+    """Connected regions of equal owner, found from scratch"""
+    left = dict(owners)
+    regions = []
+    while left:
+        cell, owner = left.popitem()
+        region = {cell}
+        stack = [cell]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in NEIGHBORS:
+                neighbor = (x + dx, y + dy)
+                if left.get(neighbor) == owner:
+                    del left[neighbor]
+                    region.add(neighbor)
+                    stack.append(neighbor)
+        regions.append(frozenset(region))
+    return sorted(regions, key=sorted)
+
+def check(regions, owners):
+    assert sorted(map(frozenset, regions.regions()), key=sorted) == bfs_regions(owners)
+    assert set(regions.parent) == set(owners)
+    for cell, owner in owners.items():
+        root = regions.find(cell)
+        assert cell in regions.members[root]
+        assert regions.owners[cell] == owner
+
+def test_random_edits_match_bfs():
+    rng = random.Random(3)
+    regions = PlotRegions()
+    owners = {}
+    for _ in range(3000):
+        cell = (rng.randrange(12), rng.randrange(12))
+        roll = rng.random()
+        if roll < 0.5:
+            if cell not in owners:
+                owners[cell] = rng.choice([1, 2])
+                regions.add(cell, owners[cell])
+        elif roll < 0.8:
+            owners.pop(cell, None)
+            regions.remove(cell)
+        else:
+            batch = [(rng.randrange(12), rng.randrange(12)) for _ in range(rng.randrange(1, 20))]
+            for removed in batch:
+                owners.pop(removed, None)
+            regions.remove_many(batch)
+        check(regions, owners)
+
+def test_owners_do_not_merge():
+    regions = PlotRegions()
+    regions.add((0, 0), 1)
+    regions.add((1, 0), 2)
+    regions.add((2, 0), 1)
+    assert len(regions.regions()) == 3
+
+def test_removing_a_bridge_splits_the_region():
+    regions = PlotRegions()
+    owners = {(x, 0): 1 for x in range(5)}
+    regions.rebuild(owners.items())
+    assert len(regions.regions()) == 1
+    regions.remove((2, 0))
+    del owners[(2, 0)]
+    check(regions, owners)
+    assert len(regions.regions()) == 2
+
+def test_outline_is_invalidated_on_change():
+    regions = PlotRegions()
+    regions.rebuild(((x, y), 1) for x in range(2) for y in range(2))
+    root = regions.find((0, 0))
+    bounds, segments = regions.outline(root)
+    assert bounds.size == (TILE_SIZE * 2, TILE_SIZE * 2)
+    assert len(segments) == 4  # Merged into one segment per side
+
+    regions.add((2, 0), 1)
+    bounds, segments = regions.outline(regions.find((0, 0)))
+    assert bounds.width == TILE_SIZE * 3
+    assert len(segments) == 6
+
+def test_bulk_removal_scales():
+    regions = PlotRegions()
+    owners = {(x, y): 1 for x in range(100) for y in range(100)}
+    regions.rebuild(owners.items())
+    removed = [(x, y) for x in range(30) for y in range(30)]
+    regions.remove_many(removed)  # Used to rebuild the region once per cell
+    for cell in removed:
+        del owners[cell]
+    check(regions, owners)
@@ -0,0 +1,53 @@
+import math
+import random
+from spatial_hash import SpatialHash
+
+class Entity:
+    def __init__(self, pos):
+        self.pos = pos
+
+def make_hash(entities, kind_of=lambda index: None):
+    index = SpatialHash(cell_size=50, locate=lambda entity: entity.pos)
+    for i, entity in enumerate(entities):
+        index.insert(entity, entity.pos, kind_of(i))
+    return index
+
+def test_query_radius_matches_brute_force():
+    rng = random.Random(4)
+    entities = [Entity((rng.uniform(-300, 300), rng.uniform(-300, 300))) for _ in range(300)]
+    index = make_hash(entities)
+    for _ in range(100):
+        point = (rng.uniform(-350, 350), rng.uniform(-350, 350))
+        radius = rng.uniform(0, 120)
+        found = index.query_radius(point, radius)
+        expected = sorted((math.hypot(e.pos[0] - point[0], e.pos[1] - point[1]), id(e)) for e in entities
+                          if math.hypot(e.pos[0] - point[0], e.pos[1] - point[1]) <= radius)
+        assert [distance for distance, _ in found] == [distance for distance, _ in expected]
+        assert {id(entity) for _, entity in found} == {entity_id for _, entity_id in expected}
+
+def test_move_and_remove_keep_buckets_consistent():
+    rng = random.Random(5)
+    entities = [Entity((rng.uniform(0, 500), rng.uniform(0, 500))) for _ in range(50)]
+    index = make_hash(entities)
+    for _ in range(500):
+        entity = rng.choice(entities)
+        entity.pos = (rng.uniform(0, 500), rng.uniform(0, 500))
+        index.move(entity, entity.pos)
+    removed = entities[:10]
+    for entity in removed:
+        index.remove(entity)
+    index.remove(removed[0])  # Removing twice is harmless
+
+    assert len(index) == 40
+    for cell, bucket in index.buckets.items():
+        assert bucket
+        for entity in bucket:
+            assert index.entries[entity][0] == cell == index.cell_of(entity.pos)
+
+def test_nearest_filters_by_kind():
+    npc = Entity((10, 0))
+    animal = Entity((30, 0))
+    index = make_hash([npc, animal], lambda i: ("npc", "animal")[i])
+    assert index.nearest((0, 0), 100) is npc
+    assert index.nearest((0, 0), 100, "animal") is animal
+    assert index.nearest((0, 0), 20, "animal") is None
@@ -0,0 +1,37 @@
+import numpy as np
+from tile_grid import TileGrid, summed_area, area_sum, KIND_CODES, OTHER, TILLED, WATERED
+
+def test_from_rows_codes_kinds_and_tills_soil():
+    grid = TileGrid.from_rows(["GSW", "P?"])
+    assert (grid.width, grid.height) == (3, 2)
+    assert grid.get_kind(1, 0) == "S"
+    assert grid.kinds[1, 1] == OTHER
+    assert grid.get_kind(2, 1) is None  # Short rows leave empty cells
+    assert grid.get_kind(5, 5) is None
+    assert grid.has_flag(1, 0, TILLED)
+    assert not grid.has_flag(0, 0, TILLED)
+
+def test_flags_are_independent_bits():
+    grid = TileGrid.from_rows(["SS"])
+    grid.set_flag(0, 0, WATERED)
+    assert grid.has_flag(0, 0, TILLED) and grid.has_flag(0, 0, WATERED)
+    grid.clear_flag(0, 0, TILLED)
+    assert not grid.has_flag(0, 0, TILLED) and grid.has_flag(0, 0, WATERED)
+    assert grid.count("S", TILLED) == 1
+    assert grid.cells("S", WATERED) == [(0, 0)]
+
+def test_area_sum_matches_brute_force():
+    rng = np.random.default_rng(0)
+    mask = rng.random((13, 17)) < 0.4
+    table = summed_area(mask)
+    for _ in range(200):
+        x0, x1 = sorted(rng.integers(0, 18, 2))
+        y0, y1 = sorted(rng.integers(0, 14, 2))
+        assert area_sum(table, x0, y0, x1, y1) == int(mask[y0:y1, x0:x1].sum())
+
+def test_summed_area_by_kind():
+    grid = TileGrid.from_rows(["GGS", "GWG"])
+    table = grid.summed_area("G")
+    assert area_sum(table, 0, 0, 3, 2) == 4
+    assert area_sum(table, 1, 1, 2, 2) == 0
+    assert grid.kinds[1, 1] == KIND_CODES["W"]
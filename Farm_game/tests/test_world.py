@@ -0,0 +1,21 @@
+from game_clock import GameClock
+from world import World
+from settings import *
+
+def test_crops_grow_on_game_time():
+    clock = GameClock()
+    world = World(clock)
+    world.create_default_map()
+    pos = (10 * TILE_SIZE, 10 * TILE_SIZE)  # In the farm area
+    assert world.plant(pos, "wheat")
+    crop = world.get_crop_at_pos(pos)
+
+    # Wheat takes 15 seconds for its 3 stages; no game time passing means no growth
+    world.update()
+    assert crop.stage == 0
+    clock.advance(5 * FPS - 1)
+    world.update()
+    assert crop.stage == 0
+    clock.advance(1)
+    world.update()
+    assert crop.stage == 1
@@ -0,0 +1,94 @@
+import pygame
+from settings import *
+
+class TileGraphics:
+    """Registry of tile images - each kind and state is drawn once and shared"""
+    _images = {}  # (kind, watered) -> Surface
+
+    @classmethod
+    def get(cls, kind, watered=False):
+        """Get the shared image for a tile kind and state"""
+        # Only soil looks different when watered
+        key = (kind, watered and kind == "S")
+        image = cls._images.get(key)
+        if image is None:
+            image = cls.render(*key)
+            cls._images[key] = image
+        return image
+
+    @classmethod
+    def clear(cls):
+        """Forget all rendered images"""
+        cls._images.clear()
+
+    @staticmethod
+    def render(kind, watered):
+        """Draw the image for a tile kind and state"""
+        image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+
+        if kind == "G":  # Grass
+            image.fill(GREEN)
+            # Add texture
+            for _ in range(8):
+                x = pygame.Rect(
+                    pygame.math.Vector2(
+                        pygame.math.Vector2(0, 0).x + (TILE_SIZE // 8) * (_ % 4),
+                        pygame.math.Vector2(0, 0).y + (TILE_SIZE // 4) * (_ // 4)
+                    ),
+                    (2, 4)
+                )
+                pygame.draw.rect(image, DARK_GREEN, x)
+
+        elif kind == "S" and watered:  # Darker, wet soil
+            image.fill((80, 50, 20))
+            for i in range(4):
+                pygame.draw.line(image, (60, 40, 15),
+                               (0, i * 8), (TILE_SIZE, i * 8), 1)
+
+        elif kind == "S":  # Soil/Tilled
+            image.fill(BROWN)
+            # Add lines for tilled look
+            for i in range(4):
+                pygame.draw.line(image, (100, 50, 10),
+                               (0, i * 8), (TILE_SIZE, i * 8), 1)
+
+        elif kind == "W":  # Water
+            image.fill(BLUE)
+            # Add wave effect
+            pygame.draw.circle(image, (100, 180, 255), (8, 8), 4)
+            pygame.draw.circle(image, (100, 180, 255), (24, 20), 3)
+
+        elif kind == "P":  # Path
+            image.fill(LIGHT_BROWN)
+            # Add stones
+            pygame.draw.circle(image, GRAY, (8, 8), 2)
+            pygame.draw.circle(image, GRAY, (24, 20), 2)
+            pygame.draw.circle(image, GRAY, (16, 24), 2)
+
+        elif kind == "T":  # Tree
+            image.fill(GREEN)
+            # Draw tree trunk
+            pygame.draw.rect(image, BROWN, (12, 16, 8, 16))
+            # Draw tree canopy
+            pygame.draw.circle(image, DARK_GREEN, (16, 12), 10)
+            pygame.draw.circle(image, (50, 120, 50), (12, 10), 6)
+            pygame.draw.circle(image, (50, 120, 50), (20, 10), 6)
+
+        elif kind == "R":  # Rock
+            image.fill(GREEN)
+            pygame.draw.polygon(image, GRAY,
+                              [(16, 8), (26, 20), (16, 28), (6, 20)])
+            pygame.draw.polygon(image, (100, 100, 100),
+                              [(16, 8), (26, 20), (16, 16)])
+
+        elif kind == "F":  # Fence
+            image.fill(GREEN)
+            pygame.draw.rect(image, BROWN, (2, 12, 28, 4))
+            pygame.draw.rect(image, BROWN, (2, 20, 28, 4))
+            pygame.draw.rect(image, BROWN, (8, 8, 4, 20))
+            pygame.draw.rect(image, BROWN, (20, 8, 4, 20))
+
+        else:  # Default
+            image.fill(BLACK)
+
+        return image
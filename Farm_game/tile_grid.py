@@ -0,0 +1,149 @@
+import numpy as np
+
+# Kind codes stored per cell (0 means there is no tile)
+EMPTY = 0
+KIND_CODES = {"G": 1, "S": 2, "W": 3, "P": 4, "T": 5, "R": 6, "F": 7}
+OTHER = 255  # Any map character without its own code
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+KIND_NAMES[OTHER] = "?"
+
+# Bit flags stored per cell
+TILLED = 1
+WATERED = 2
+
+FARMABLE_KINDS = ("G", "S")
+
+def summed_area(mask):
+    """Summed-area table of a 2D array, padded with a leading row and column of zeros"""
+    height, width = mask.shape
+    table = np.zeros((height + 1, width + 1), dtype=np.int32)
+    np.cumsum(np.cumsum(mask, axis=0, dtype=np.int32), axis=1, out=table[1:, 1:])
+    return table
+
+def area_sum(table, x0, y0, x1, y1):
+    """Sum over the cells [x0, x1) x [y0, y1) in O(1) from a summed-area table"""
+    return int(table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0])
+
+class TileGrid:
+    """Compact tile storage: a uint8 kind code and uint8 bit flags per cell"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.kinds = np.zeros((height, width), dtype=np.uint8)
+        self.flags = np.zeros((height, width), dtype=np.uint8)
+
+        # Binary map that kinds are paged in from, one chunk at a time
+        self.source = None
+        self.loaded_chunks = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from rows of tile characters"""
+        width = max((len(row) for row in rows), default=0)
+        grid = cls(width, len(rows))
+        for y, row in enumerate(rows):
+            codes = [KIND_CODES.get(tile_type, OTHER) for tile_type in row]
+            grid.kinds[y, :len(codes)] = codes
+        grid.flags[grid.kinds == KIND_CODES["S"]] |= TILLED
+        return grid
+
+    @classmethod
+    def from_map_file(cls, map_file):
+        """Build a grid that reads chunks lazily from a memory-mapped MapFile"""
+        grid = cls(map_file.width, map_file.height)
+        grid.source = map_file
+        grid.loaded_chunks = np.zeros((map_file.chunks_y, map_file.chunks_x), dtype=bool)
+        return grid
+
+    def load_chunk(self, chunk_x, chunk_y):
+        """Copy one chunk of the source map into the grid"""
+        self.loaded_chunks[chunk_y, chunk_x] = True
+        size = self.source.chunk_size
+        x0, y0 = chunk_x * size, chunk_y * size
+        x1, y1 = min(x0 + size, self.width), min(y0 + size, self.height)
+        codes = self.source.read_chunk(chunk_x, chunk_y)[:y1 - y0, :x1 - x0]
+        self.kinds[y0:y1, x0:x1] = codes
+        self.flags[y0:y1, x0:x1][codes == KIND_CODES["S"]] |= TILLED
+
+    def ensure_loaded(self, x0, y0, x1=None, y1=None):
+        """Page in the source chunks covering a cell or the area [x0, x1) x [y0, y1)"""
+        if self.source is None:
+            return
+        size = self.source.chunk_size
+        x1 = x0 + 1 if x1 is None else x1
+        y1 = y0 + 1 if y1 is None else y1
+        for chunk_y in range(max(y0, 0) // size, (min(y1, self.height) - 1) // size + 1):
+            for chunk_x in range(max(x0, 0) // size, (min(x1, self.width) - 1) // size + 1):
+                if not self.loaded_chunks[chunk_y, chunk_x]:
+                    self.load_chunk(chunk_x, chunk_y)
+
+    def ensure_all_loaded(self):
+        """Page in the whole source map (needed by grid-wide queries)"""
+        if self.source is not None and not self.loaded_chunks.all():
+            self.ensure_loaded(0, 0, self.width, self.height)
+
+    @staticmethod
+    def code(kind):
+        """Get the kind code for a tile character"""
+        return KIND_CODES.get(kind, OTHER)
+
+    def in_bounds(self, x, y):
+        """Check if a grid position is inside the grid"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_kind(self, x, y):
+        """Get tile kind at a grid position, or None if there is no tile"""
+        if not self.in_bounds(x, y):
+            return None
+        if self.source is not None:
+            self.ensure_loaded(x, y)
+        code = self.kinds[y, x]
+        if code == EMPTY:
+            return None
+        return KIND_NAMES[code]
+
+    def set_kind(self, x, y, kind):
+        """Set tile kind at a grid position"""
+        self.ensure_loaded(x, y)
+        self.kinds[y, x] = self.code(kind)
+
+    def has_flag(self, x, y, flag):
+        """Check if a flag is set on a cell"""
+        if self.source is not None:
+            self.ensure_loaded(x, y)
+        return bool(self.flags[y, x] & flag)
+
+    def set_flag(self, x, y, flag):
+        """Set a flag on a cell"""
+        self.ensure_loaded(x, y)
+        self.flags[y, x] |= flag
+
+    def clear_flag(self, x, y, flag):
+        """Clear a flag on a cell"""
+        self.ensure_loaded(x, y)
+        self.flags[y, x] &= ~flag & 0xFF
+
+    def mask(self, kind=None, flags=0):
+        """Boolean array of cells matching a kind and having all given flags"""
+        self.ensure_all_loaded()
+        if kind is None:
+            result = self.kinds != EMPTY
+        else:
+            result = self.kinds == self.code(kind)
+        if flags:
+            result &= (self.flags & flags) == flags
+        return result
+
+    def summed_area(self, kind=None, flags=0):
+        """Summed-area table of the cells matching a kind and flags"""
+        return summed_area(self.mask(kind, flags))
+
+    def cells(self, kind=None, flags=0):
+        """List of (x, y) grid positions matching a kind and flags"""
+        ys, xs = np.nonzero(self.mask(kind, flags))
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def count(self, kind=None, flags=0):
+        """Number of cells matching a kind and flags"""
+        return int(np.count_nonzero(self.mask(kind, flags)))
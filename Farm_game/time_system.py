@@ -1,8 +1,32 @@
 import pygame
 from settings import *
+from versioning import Versioned
+
+MINUTES_PER_DAY = 24 * 60
+
+# Overlay tint through the day as (hour, color) - blended between entries
+TINT_KEYFRAMES = [
+    (0, (0, 0, 40)),  # Night
+    (5, (0, 0, 40)),
+    (6.5, (70, 40, 70)),  # Dawn
+    (8, (70, 40, 70)),
+    (16, (110, 50, 10)),  # Dusk
+    (17, (110, 50, 10)),
+    (18, (0, 0, 40)),  # Night
+    (24, (0, 0, 40)),
+]
 
 class TimeSystem:
+    # Overlay (tint, alpha) for every minute of the day, shared by all instances
+    lighting_table = None
+    
+    # Clock shown on the HUD - a new minute, day or season bumps self.version
+    time = Versioned(lambda hour: int(hour * 60))
+    day = Versioned()
+    season = Versioned()
+    
     def __init__(self):
+        self.version = 0
         self.time = 6.0  # Start at 6 AM
         self.day = 1
         self.season = "Spring"
@@ -10,6 +34,29 @@ class TimeSystem:
         self.days_per_season = 10
         self.time_speed = TIME_SPEED
         
+        if TimeSystem.lighting_table is None:
+            TimeSystem.lighting_table = self.build_lighting_table()
+        
+    @classmethod
+    def build_lighting_table(cls):
+        """Precompute the overlay tint and alpha of every in-game minute"""
+        table = []
+        for minute in range(MINUTES_PER_DAY):
+            hour = minute / 60
+            alpha = cls.darkness_alpha_at(hour)
+            alpha = int(round(alpha / OVERLAY_ALPHA_STEP) * OVERLAY_ALPHA_STEP)
+            table.append((cls.tint_at(hour) if alpha else None, alpha))
+        return table
+        
+    @staticmethod
+    def tint_at(hour):
+        """Overlay color at an hour, blended between the tint keyframes"""
+        for (start, start_color), (end, end_color) in zip(TINT_KEYFRAMES, TINT_KEYFRAMES[1:]):
+            if start <= hour < end:
+                t = (hour - start) / (end - start)
+                return tuple(int(a + (b - a) * t) for a, b in zip(start_color, end_color))
+        return TINT_KEYFRAMES[-1][1]
+        
     def update(self, dt=1):
         """Update time"""
         self.time += self.time_speed * dt
@@ -48,16 +95,29 @@ class TimeSystem:
             
         return f"{hour_12}:{minute:02d} {period}"
         
+    def get_minute(self):
+        """Minute of the day (0 - 1439)"""
+        return int(self.time * 60) % MINUTES_PER_DAY
+        
+    def get_lighting(self):
+        """Get the overlay (tint, alpha) for the current minute"""
+        return self.lighting_table[self.get_minute()]
+        
     def get_darkness_alpha(self):
         """Get darkness overlay alpha based on time"""
-        if NIGHT_END <= self.time < NIGHT_START:
+        return self.get_lighting()[1]
+        
+    @staticmethod
+    def darkness_alpha_at(hour):
+        """Darkness overlay alpha at an hour of the day"""
+        if NIGHT_END <= hour < NIGHT_START:
             # Daytime - no darkness
-            if self.time < 8:
+            if hour < 8:
                 # Dawn - gradually brighten
-                return int(150 * (1 - (self.time - NIGHT_END) / 2))
-            elif self.time > 16:
+                return int(150 * (1 - (hour - NIGHT_END) / 2))
+            elif hour > 16:
                 # Dusk - gradually darken
-                return int(150 * ((self.time - 16) / 2))
+                return int(150 * ((hour - 16) / 2))
             return 0
         else:
             # Nighttime
@@ -1,45 +1,53 @@
 import pygame
 from settings import *
+from fonts import get_font
+from versioning import CachedPanel
 
 class UI:
     def __init__(self):
-        self.font = pygame.font.Font(None, 22)
-        self.title_font = pygame.font.Font(None, 28)
-        self.small_font = pygame.font.Font(None, 18)
-        self.tiny_font = pygame.font.Font(None, 14)
+        self.font = get_font(22)
+        self.title_font = get_font(28)
+        self.small_font = get_font(18)
+        self.tiny_font = get_font(14)
         
         # Settings
         self.show_controls = False
         
+        # Panels redrawn only when what they show changes
+        self.stats_panel = CachedPanel()
+        
     def toggle_controls(self):
         """Toggle controls visibility"""
         self.show_controls = not self.show_controls
         
     def draw_player_stats(self, surface, player, time_system):
         """Draw player stats in top-left corner"""
+        key = (player.version, time_system.version)
+        self.stats_panel.draw(surface, (10, 10), (250, 120), key,
+                              lambda panel: self.render_player_stats(panel, player, time_system))
+        
+    def render_player_stats(self, surface, player, time_system):
+        """Render player stats into their panel"""
         # Background
-        bg = pygame.Surface((250, 120))
-        bg.set_alpha(200)
-        bg.fill((40, 40, 40))
-        surface.blit(bg, (10, 10))
+        surface.fill((40, 40, 40, 200))
         
         # Border
-        pygame.draw.rect(surface, WHITE, (10, 10, 250, 120), 2)
+        pygame.draw.rect(surface, WHITE, (0, 0, 250, 120), 2)
         
-        y_offset = 20
+        y_offset = 10
         
         # Money
         money_text = self.font.render(f"Money: ${player.money}", True, YELLOW)
-        surface.blit(money_text, (20, y_offset))
+        surface.blit(money_text, (10, y_offset))
         
         # Energy bar
         y_offset += 30
         energy_text = self.font.render(f"Energy:", True, WHITE)
-        surface.blit(energy_text, (20, y_offset))
+        surface.blit(energy_text, (10, y_offset))
         
         bar_width = 150
         bar_height = 16
-        bar_x = 100
+        bar_x = 90
         bar_y = y_offset + 2
         
         # Background bar
@@ -55,14 +63,14 @@ class UI:
         y_offset += 30
         tool_text = self.font.render(f"Tool: {player.current_tool.replace('_', ' ').title()}", 
                                      True, WHITE)
-        surface.blit(tool_text, (20, y_offset))
+        surface.blit(tool_text, (10, y_offset))
         
         # Time and date
         y_offset += 30
         time_str = time_system.get_time_string()
         day_str = time_system.get_day_string()
         time_text = self.font.render(f"{day_str} - {time_str}", True, WHITE)
-        surface.blit(time_text, (20, y_offset))
+        surface.blit(time_text, (10, y_offset))
         
     def draw_controls(self, surface, screen_width, screen_height):
         """Draw controls guide"""
@@ -0,0 +1,82 @@
+import pygame
+
+_MISSING = object()
+
+class Versioned:
+    """Attribute that bumps its owner's version when its value (or key(value)) changes"""
+
+    def __init__(self, key=None):
+        self.key = key  # Maps a value to what observers care about, e.g. whole minutes
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.attr)
+
+    def __set__(self, obj, value):
+        old = getattr(obj, self.attr, _MISSING)
+        setattr(obj, self.attr, value)
+        if old is _MISSING or self.key is None:
+            changed = old is _MISSING or old != value
+        else:
+            changed = self.key(old) != self.key(value)
+        if changed:
+            obj.version = getattr(obj, "version", 0) + 1
+
+class VersionedDict(dict):
+    """Dict with a version counter that is bumped on every change"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.version += 1
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+class CachedPanel:
+    """Surface that is only redrawn when the state it shows changes"""
+
+    def __init__(self):
+        self.surface = None
+        self.key = None  # Versions/state the surface was drawn from
+
+    def draw(self, surface, pos, size, key, render):
+        """Blit the panel, calling render(panel_surface) first if key changed"""
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.key = None
+        if key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            render(self.surface)
+            self.key = key
+        surface.blit(self.surface, pos)
+
+    def invalidate(self):
+        """Force a redraw on the next draw"""
+        self.key = None
@@ -1,80 +1,235 @@
 import pygame
+import numpy as np
+from chunk import Chunk
 from tile import Tile
+from tile_graphics import TileGraphics
+from tile_grid import TileGrid, KIND_CODES, KIND_NAMES, EMPTY, TILLED, WATERED
+from map_format import MapFile, is_map_file
 from crop import Crop
+from crop_store import CropStore
+from game_clock import GameClock
 from settings import *
-import time
 
 class World:
-    def __init__(self):
-        self.tiles = pygame.sprite.Group()
+    def __init__(self, clock=None):
         self.crops = pygame.sprite.Group()
-        self.tile_map = {}  # Store tiles by grid position
-        self.current_time = time.time()
+        self.crop_index = {}  # Crops by grid position
+        self.crop_store = CropStore()  # Growth state of all crops
+        self.chunks = {}  # Loaded chunks (baked terrain) by chunk position
+        self.grid = TileGrid(MAP_WIDTH, MAP_HEIGHT)  # Kind and flags of every cell
+        self.clock = GameClock() if clock is None else clock  # Crops grow on game time
+        
+        # Changes since the last frame, for redrawing only what changed
+        self.version = 0
+        self.changed_tiles = []
+        
+    @property
+    def current_time(self):
+        """Game time in seconds, what crop growth times are measured in"""
+        return self.clock.now / FPS
+        
+    @property
+    def width(self):
+        return self.grid.width
+        
+    @property
+    def height(self):
+        return self.grid.height
         
     def load(self, filepath):
-        """Load map from file"""
+        """Load map from a binary (memory-mapped) or text map file"""
         try:
-            with open(filepath) as f:
-                for y, row in enumerate(f):
-                    for x, tile_type in enumerate(row.strip()):
-                        pos = (x * TILE_SIZE, y * TILE_SIZE)
-                        tile = Tile(pos, tile_type)
-                        self.tiles.add(tile)
-                        self.tile_map[(x, y)] = tile
+            if is_map_file(filepath):
+                grid = TileGrid.from_map_file(MapFile(filepath))
+            else:
+                with open(filepath) as f:
+                    grid = TileGrid.from_rows([row.strip() for row in f])
         except FileNotFoundError:
             # Create default map if file doesn't exist
             self.create_default_map()
+            return
+            
+        self.reset_chunks()
+        self.grid = grid
             
     def create_default_map(self):
         """Create a default map layout"""
-        for y in range(MAP_HEIGHT):
-            for x in range(MAP_WIDTH):
-                pos = (x * TILE_SIZE, y * TILE_SIZE)
+        self.reset_chunks()
+        self.grid = TileGrid(MAP_WIDTH, MAP_HEIGHT)
+        ys, xs = np.mgrid[0:MAP_HEIGHT, 0:MAP_WIDTH]
+        kinds = self.grid.kinds
+        
+        # Create varied terrain, lowest priority first
+        kinds[:] = KIND_CODES["G"]
+        kinds[(xs + ys) % 8 == 0] = KIND_CODES["P"]  # Paths
+        kinds[(xs % 4 == 0) & (ys % 4 == 0)] = KIND_CODES["R"]  # Scattered rocks
+        kinds[(xs >= 8) & (xs <= 12) & (ys >= 8) & (ys <= 12)] = KIND_CODES["S"]  # Center farm area
+        kinds[ys > MAP_HEIGHT - 3] = KIND_CODES["W"]  # Bottom - water
+        kinds[(xs < 2) | (xs > MAP_WIDTH - 3)] = KIND_CODES["F"]  # Side borders
+        kinds[:3] = np.where(xs[:3] % 3 == 0, KIND_CODES["T"], KIND_CODES["G"])  # Top border - trees
+        
+        self.grid.flags[kinds == KIND_CODES["S"]] |= TILLED
+        
+    def reset_chunks(self):
+        """Drop all loaded chunks"""
+        for chunk in self.chunks.values():
+            chunk.unload()
+        self.chunks.clear()
+        
+    def get_chunk(self, chunk_pos):
+        """Get a chunk, building it if it isn't loaded yet"""
+        chunk = self.chunks.get(chunk_pos)
+        if chunk is None:
+            chunk = Chunk(self, chunk_pos)
+            chunk.build()
+            self.chunks[chunk_pos] = chunk
+        return chunk
+        
+    def unload_chunk(self, chunk_pos):
+        """Evict a loaded chunk"""
+        chunk = self.chunks.pop(chunk_pos, None)
+        if chunk:
+            chunk.unload()
+            
+    def stream_chunks(self, focus_pos, view_rect=None):
+        """Load chunks around a pixel position and the view, evict far away ones"""
+        chunk_pixels = CHUNK_SIZE * TILE_SIZE
+        chunks_x = (self.width + CHUNK_SIZE - 1) // CHUNK_SIZE
+        chunks_y = (self.height + CHUNK_SIZE - 1) // CHUNK_SIZE
+        focus_x = int(focus_pos[0]) // chunk_pixels
+        focus_y = int(focus_pos[1]) // chunk_pixels
+        
+        # Chunks around the focus point
+        wanted = set()
+        for cy in range(focus_y - CHUNK_LOAD_RADIUS, focus_y + CHUNK_LOAD_RADIUS + 1):
+            for cx in range(focus_x - CHUNK_LOAD_RADIUS, focus_x + CHUNK_LOAD_RADIUS + 1):
+                wanted.add((cx, cy))
                 
-                # Create varied terrain
-                if y < 3:  # Top border - trees
-                    tile_type = "T" if x % 3 == 0 else "G"
-                elif x < 2 or x > MAP_WIDTH - 3:  # Side borders
-                    tile_type = "F"
-                elif y > MAP_HEIGHT - 3:  # Bottom - water
-                    tile_type = "W"
-                elif 8 <= x <= 12 and 8 <= y <= 12:  # Center farm area
-                    tile_type = "S"
-                elif x % 4 == 0 and y % 4 == 0:  # Scattered rocks
-                    tile_type = "R"
-                elif (x + y) % 8 == 0:  # Paths
-                    tile_type = "P"
-                else:
-                    tile_type = "G"
+        # Chunks intersecting the view
+        if view_rect:
+            for cy in range(view_rect.top // chunk_pixels, (view_rect.bottom - 1) // chunk_pixels + 1):
+                for cx in range(view_rect.left // chunk_pixels, (view_rect.right - 1) // chunk_pixels + 1):
+                    wanted.add((cx, cy))
                     
-                tile = Tile(pos, tile_type)
-                self.tiles.add(tile)
-                self.tile_map[(x, y)] = tile
+        for chunk_pos in wanted:
+            if 0 <= chunk_pos[0] < chunks_x and 0 <= chunk_pos[1] < chunks_y:
+                self.get_chunk(chunk_pos)
+                
+        # Evict chunks that are well outside the wanted area
+        for chunk_pos in list(self.chunks):
+            if chunk_pos in wanted:
+                continue
+            distance = max(abs(chunk_pos[0] - focus_x), abs(chunk_pos[1] - focus_y))
+            if distance > CHUNK_EVICT_RADIUS:
+                self.unload_chunk(chunk_pos)
+                
+    def get_tile(self, grid_pos):
+        """Get a view of the tile at grid position"""
+        if self.grid.get_kind(*grid_pos) is None:
+            return None
+        return Tile(self.grid, grid_pos)
+        
+    def mark_dirty(self, grid_pos):
+        """Schedule a changed tile to be redrawn in its baked chunk"""
+        self.version += 1
+        self.changed_tiles.append(grid_pos)
+        chunk = self.chunks.get((grid_pos[0] // CHUNK_SIZE, grid_pos[1] // CHUNK_SIZE))
+        if chunk:
+            chunk.mark_dirty(grid_pos)
+            
+    def draw_terrain(self, surface, camera):
+        """Draw the baked terrain of loaded chunks that are in view"""
+        if camera.render_scale != 1:
+            self.draw_scaled_terrain(surface, camera)
+            return
+        for chunk in self.chunks.values():
+            if camera.is_visible(chunk.rect):
+                chunk.draw(surface, camera)
+                
+    def draw_scaled_terrain(self, surface, camera):
+        """Draw the tiles in view with pre-scaled tile images"""
+        # Baked chunks would be huge at high scales, so blit tiles one by one
+        view = camera.rect
+        start_x = max(0, view.left // TILE_SIZE)
+        start_y = max(0, view.top // TILE_SIZE)
+        end_x = min(self.width, (view.right - 1) // TILE_SIZE + 1)
+        end_y = min(self.height, (view.bottom - 1) // TILE_SIZE + 1)
+        
+        self.grid.ensure_loaded(start_x, start_y, end_x, end_y)
+        kinds = self.grid.kinds[start_y:end_y, start_x:end_x].tolist()
+        flags = self.grid.flags[start_y:end_y, start_x:end_x].tolist()
+        
+        blits = []
+        for grid_y, (kind_row, flag_row) in enumerate(zip(kinds, flags), start_y):
+            for grid_x, (code, flag) in enumerate(zip(kind_row, flag_row), start_x):
+                if code == EMPTY:
+                    continue
+                image = camera.image(TileGraphics.get(KIND_NAMES[code], bool(flag & WATERED)))
+                blits.append((image, camera.apply_point((grid_x * TILE_SIZE, grid_y * TILE_SIZE))))
+        surface.blits(blits, doreturn=False)
                 
     def get_tile_at_pos(self, pixel_pos):
         """Get tile at pixel position"""
         grid_x = pixel_pos[0] // TILE_SIZE
         grid_y = pixel_pos[1] // TILE_SIZE
-        return self.tile_map.get((grid_x, grid_y))
+        return self.get_tile((grid_x, grid_y))
+        
+    def visible_crops(self, view_rect):
+        """Crops on tiles that intersect a world rect"""
+        start_x = max(0, view_rect.left // TILE_SIZE)
+        start_y = max(0, view_rect.top // TILE_SIZE)
+        end_x = (view_rect.right - 1) // TILE_SIZE + 1
+        end_y = (view_rect.bottom - 1) // TILE_SIZE + 1
+        
+        # Look up the visible cells, unless there are fewer crops than cells
+        if (end_x - start_x) * (end_y - start_y) > len(self.crop_index):
+            return [crop for crop in self.crops if view_rect.colliderect(crop.rect)]
+        crops = []
+        for y in range(start_y, end_y):
+            for x in range(start_x, end_x):
+                crop = self.crop_index.get((x, y))
+                if crop:
+                    crops.append(crop)
+        return crops
+        
+    def crop_at(self, grid_pos):
+        """Get crop at grid position"""
+        return self.crop_index.get(grid_pos)
         
     def get_crop_at_pos(self, pixel_pos):
         """Get crop at pixel position"""
-        for crop in self.crops:
-            if crop.rect.collidepoint(pixel_pos):
-                return crop
-        return None
+        return self.crop_at((pixel_pos[0] // TILE_SIZE, pixel_pos[1] // TILE_SIZE))
+        
+    def add_crop(self, crop):
+        """Add a crop to the world and index it by grid position"""
+        grid_pos = (crop.rect.x // TILE_SIZE, crop.rect.y // TILE_SIZE)
+        self.crop_index[grid_pos] = crop
+        self.version += 1
+        self.crops.add(crop)
+        
+    def remove_crop(self, crop):
+        """Remove a crop from the world and the index"""
+        grid_pos = (crop.rect.x // TILE_SIZE, crop.rect.y // TILE_SIZE)
+        if self.crop_index.get(grid_pos) is crop:
+            del self.crop_index[grid_pos]
+        self.version += 1
+        if crop.store is self.crop_store:
+            crop.detach()
+        crop.kill()
         
     def till(self, pixel_pos):
         """Till soil at position"""
         tile = self.get_tile_at_pos(pixel_pos)
-        if tile:
-            return tile.till()
+        if tile and tile.till():
+            self.mark_dirty(tile.grid_pos)
+            return True
         return False
         
     def water(self, pixel_pos):
         """Water tile at position"""
         tile = self.get_tile_at_pos(pixel_pos)
         if tile and tile.water():
+            self.mark_dirty(tile.grid_pos)
             # Also water any crop on this tile
             crop = self.get_crop_at_pos(pixel_pos)
             if crop:
@@ -86,20 +241,18 @@ class World:
         """Plant a seed at position"""
         grid_x = pixel_pos[0] // TILE_SIZE
         grid_y = pixel_pos[1] // TILE_SIZE
-        tile = self.tile_map.get((grid_x, grid_y))
+        tile = self.get_tile((grid_x, grid_y))
         
         # Check if tile is farmable and tilled
         if tile and tile.kind == "S":
             # Check if there's already a crop here
-            tile_pos = (grid_x * TILE_SIZE, grid_y * TILE_SIZE)
-            for crop in self.crops:
-                if crop.rect.topleft == tile_pos:
-                    return False  # Already has a crop
+            if (grid_x, grid_y) in self.crop_index:
+                return False  # Already has a crop
                     
             # Plant new crop
-            crop = Crop(tile_pos, crop_type)
-            crop.time_planted = self.current_time
-            self.crops.add(crop)
+            tile_pos = (grid_x * TILE_SIZE, grid_y * TILE_SIZE)
+            crop = Crop(tile_pos, crop_type, self.current_time, self.crop_store)
+            self.add_crop(crop)
             return True
         return False
         
@@ -108,21 +261,20 @@ class World:
         crop = self.get_crop_at_pos(pixel_pos)
         if crop and crop.ready_to_harvest:
             value = crop.harvest()
-            crop.kill()
+            self.remove_crop(crop)
             return crop.crop_type, value
         return None, 0
         
     def update(self):
         """Update world state"""
-        self.current_time = time.time()
-        
-        # Update all crops
-        for crop in self.crops:
-            crop.update(self.current_time)
+        # Update all crops in one pass
+        self.crop_store.update(self.current_time)
             
-    def draw_grid(self, surface):
+    def draw_grid(self, surface, camera):
         """Draw grid lines for debugging"""
-        for x in range(0, SCREEN_WIDTH, TILE_SIZE):
-            pygame.draw.line(surface, (100, 100, 100), (x, 0), (x, SCREEN_HEIGHT), 1)
-        for y in range(0, SCREEN_HEIGHT, TILE_SIZE):
-            pygame.draw.line(surface, (100, 100, 100), (0, y), (SCREEN_WIDTH, y), 1)
\ No newline at end of file
+        width, height = surface.get_size()
+        start_x, start_y, tile_size, _ = camera.apply(pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE))
+        for x in range(start_x % tile_size, width, tile_size):
+            pygame.draw.line(surface, (100, 100, 100), (x, 0), (x, height), 1)
+        for y in range(start_y % tile_size, height, tile_size):
+            pygame.draw.line(surface, (100, 100, 100), (0, y), (width, y), 1)
\ No newline at end of file